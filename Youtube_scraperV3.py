@@ -1,22 +1,133 @@
 import logging
-from playwright.sync_api import sync_playwright
+from selector_resolver import get_default_resolver
+from metrics import ScrapeMetrics
 import time
 import json
 from datetime import datetime
 import urllib.parse
 import argparse
 import os
+from collections import Counter
 
 logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger(__name__)
 
-def get_playlist_search_url(course_name):
+YOUTUBE_BASE_URL = "https://www.youtube.com"
+
+# Candidate selectors for the first playlist link on the search results page,
+# raced against each other by the selector resolver
+PLAYLIST_LINK_SELECTORS = [
+    'ytd-item-section-renderer ytd-lockup-view-model a.yt-lockup-metadata-view-model-wiz__title',
+    'ytd-item-section-renderer a#video-title',
+    'ytd-item-section-renderer a[href*="/playlist?list="]',
+    'ytd-item-section-renderer a[href*="&list="]'
+]
+# Candidate selectors for the playlist owner on the playlist page
+CHANNEL_NAME_SELECTORS = [
+    'ytd-channel-name yt-formatted-string a',
+    'yt-page-header-renderer yt-content-metadata-view-model a',
+    'ytd-playlist-header-renderer a.yt-simple-endpoint[href^="/@"]'
+]
+PLAYLIST_ROW_SELECTOR = '#contents ytd-playlist-video-renderer'
+
+# Title and href of a playlist link; the title comes from the link itself or
+# its heading rather than from a position-dependent selector
+PLAYLIST_LINK_INFO_JS = """
+el => ({
+    title: (el.getAttribute('title') || (el.closest('h3') || el).textContent || '').trim(),
+    href: el.getAttribute('href')
+})
+"""
+
+def get_base_url():
+    """Origin all YouTube URLs are built on; ``YOUTUBE_BASE_URL`` in the environment overrides it (e.g. for fixtures)."""
+    return os.environ.get("YOUTUBE_BASE_URL", YOUTUBE_BASE_URL).rstrip("/")
+
+def origin_of(url):
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def get_playlist_search_url(course_name, base_url=None):
     # Append " in English" to enforce language filtering
     modified_course_name = f"{course_name} in English -hindi -हिन्दी -हिंदी"
     encoded_course = urllib.parse.quote(modified_course_name)
     
     # Use the search filter that prioritizes playlists
-    return f"https://www.youtube.com/results?search_query={encoded_course}&sp=EgIQAw%253D%253D"
+    return f"{base_url or get_base_url()}/results?search_query={encoded_course}&sp=EgIQAw%253D%253D"
+
+# Resource types and URL fragments aborted when resource blocking is enabled;
+# scraping only needs the DOM text and hrefs
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+TRACKING_URL_PATTERNS = (
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+    "googletagmanager.com", "/pagead/", "/ptracking", "/api/stats/", "/youtubei/v1/log_event", "/generate_204",
+)
+# Typical transfer sizes, used to estimate the bytes saved by blocked requests
+TYPICAL_RESOURCE_BYTES = {"image": 15_000, "media": 250_000, "font": 40_000, "tracking": 1_000}
+
+class ResourceBlocker:
+    """Aborts image, media, font and tracking requests and counts what was saved.
+    
+    Attach with ``page.route("**/*", blocker.handle)`` (or ``handle_async``
+    for the async API) and read ``report()`` once the scrape is done.
+    """
+    
+    def __init__(self):
+        self.blocked = Counter()
+        self.allowed = 0
+    
+    def should_block(self, request):
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            self.blocked[request.resource_type] += 1
+            return True
+        if any(pattern in request.url for pattern in TRACKING_URL_PATTERNS):
+            self.blocked["tracking"] += 1
+            return True
+        self.allowed += 1
+        return False
+    
+    def handle(self, route):
+        if self.should_block(route.request):
+            route.abort()
+        else:
+            route.continue_()
+    
+    async def handle_async(self, route):
+        if self.should_block(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    def report(self):
+        return {
+            "requests_blocked": sum(self.blocked.values()),
+            "requests_allowed": self.allowed,
+            "blocked_by_type": dict(self.blocked),
+            "estimated_bytes_saved": sum(TYPICAL_RESOURCE_BYTES.get(kind, 0) * n for kind, n in self.blocked.items()),
+        }
+
+def video_id_from_url(href):
+    """Return the ``v`` parameter of a watch URL, or None."""
+    query = urllib.parse.urlsplit(href or "").query
+    return urllib.parse.parse_qs(query).get("v", [None])[0]
+
+def thumbnail_url(video_id):
+    return f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+
+def is_playlist_link(href):
+    return bool(href) and ('/playlist?list=' in href or '&list=' in href)
+
+def new_video_data(engine, url=""):
+    """Return an empty result in the playlist_info/videos/metadata output schema."""
+    return {
+        "playlist_info": {},
+        "videos": [],
+        "metadata": {
+            "scraped_at": datetime.now().isoformat(),
+            "url": url,
+            "engine": engine
+        }
+    }
 
 def parse_duration(duration_text):
     """Convert YouTube duration text (HH:MM:SS or MM:SS) to total seconds."""
@@ -33,12 +144,162 @@ def parse_duration(duration_text):
         log.warning(f"Failed to parse duration '{duration_text}': {e}")
         return 0
 
-def save_to_json(data, output_dir="output"):
+# Pulls the fields of every playlist row in one evaluate call instead of
+# several Playwright round-trips per row.
+PLAYLIST_ROWS_JS = """
+(rows, [start, end] = [0]) => rows.slice(start, end ?? rows.length).map(row => {
+    const text = el => el ? el.textContent.trim() : null;
+    const title = row.querySelector('#video-title');
+    const thumbnail = row.querySelector('ytd-thumbnail img');
+    return {
+        title: text(title),
+        href: title ? title.getAttribute('href') : null,
+        channel: text(row.querySelector('#channel-name #text')),
+        thumbnail: thumbnail ? thumbnail.getAttribute('src') : null,
+        duration: text(row.querySelector('ytd-thumbnail-overlay-time-status-renderer .badge-shape-wiz__text')),
+        metadata: Array.from(row.querySelectorAll('#metadata-line yt-formatted-string'), el => el.textContent.trim())
+    };
+})
+"""
+
+# Resolves to the index past the run of filled-in rows starting at ``previous``
+# once that run is non-empty. A row counts as filled in when its title link
+# and duration badge have rendered, so rows are never read half-built.
+ROW_GROWTH_JS = """
+([selector, previous]) => {
+    const rows = document.querySelectorAll(selector);
+    const filled = row => {
+        const title = row.querySelector('#video-title');
+        const badge = row.querySelector('ytd-thumbnail-overlay-time-status-renderer .badge-shape-wiz__text');
+        return Boolean(title && title.getAttribute('href') && title.textContent.trim() && badge && badge.textContent.trim());
+    };
+    let ready = previous;
+    while (ready < rows.length && filled(rows[ready])) ready++;
+    return ready > previous ? ready : false;
+}
+"""
+
+ROW_COUNT_JS = f"() => document.querySelectorAll('{PLAYLIST_ROW_SELECTOR}').length"
+
+# Reads the "N videos" figure from the playlist header's stats line, null if
+# absent. Only a standalone "N videos" item counts, so a number in the
+# playlist title, the description or a row's title is never taken for it.
+ADVERTISED_COUNT_JS = r"""
+() => {
+    const stats = document.querySelectorAll(
+        'ytd-playlist-byline-renderer, ytd-playlist-header-renderer .metadata-stats, ' +
+        'yt-page-header-renderer yt-content-metadata-view-model');
+    for (const el of stats) {
+        for (const item of (el.innerText || '').split(/[\u2022\n]/)) {
+            const match = item.match(/^\s*(\d[\d,.]*)\s+videos?\s*$/i);
+            if (match) return parseInt(match[1].replace(/[,.]/g, ''), 10);
+        }
+    }
+    return null;
+}
+"""
+
+SCROLL_TO_BOTTOM_JS = 'window.scrollTo(0, document.documentElement.scrollHeight)'
+
+def next_growth_timeout(latency_ms, min_timeout=2000, max_timeout=10000):
+    """Adapt the no-growth timeout to how long the last batch of rows took to appear."""
+    return int(min(max_timeout, max(min_timeout, latency_ms * 4)))
+
+def extract_playlist_rows(page, start=0, end=None):
+    """Return the raw fields of the loaded playlist rows ``start:end`` as plain dicts."""
+    return page.eval_on_selector_all(PLAYLIST_ROW_SELECTOR, PLAYLIST_ROWS_JS, [start, end])
+
+def iter_playlist_row_batches(page, expected_count=None, min_timeout=2000, max_timeout=10000, stop_when=None,
+                              metrics=None):
+    """Scroll the playlist and yield the raw fields of newly loaded rows, batch by batch.
+    
+    Waits on filled-in rows appearing instead of sleeping between scrolls,
+    with a timeout that adapts to the observed load latency; only rows whose
+    title and duration have rendered are read. Rows still unfilled when the
+    timeout runs out are read as they are, so one broken row can't hold
+    back the rest. Stops as soon as ``expected_count`` rows are read, when
+    ``stop_when(count)`` returns True, or when a scroll adds no rows in time.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    
+    metrics = metrics or ScrapeMetrics(enabled=False)
+    count = 0
+    ready = page.evaluate(ROW_GROWTH_JS, [PLAYLIST_ROW_SELECTOR, 0]) or 0
+    timeout = min_timeout
+    while True:
+        if ready > count:
+            with metrics.phase("row_extraction"):
+                rows = extract_playlist_rows(page, count, ready)
+            count += len(rows)
+            log.debug(f"Loaded {count} playlist rows")
+            yield rows
+        if (expected_count and count >= expected_count) or (stop_when and stop_when(count)):
+            break
+        start = time.monotonic()
+        try:
+            with metrics.phase("scrolling"):
+                page.evaluate(SCROLL_TO_BOTTOM_JS)
+                ready = page.wait_for_function(ROW_GROWTH_JS, arg=[PLAYLIST_ROW_SELECTOR, count], timeout=timeout).json_value()
+        except PlaywrightTimeoutError:
+            ready = page.evaluate(ROW_COUNT_JS)
+            if ready > count:
+                log.debug(f"Reading {ready - count} rows that did not fill in within {timeout}ms")
+                continue
+            if expected_count and count < expected_count:
+                log.warning(f"Playlist advertises {expected_count} videos but no more rows loaded after {count}")
+            break
+        timeout = next_growth_timeout((time.monotonic() - start) * 1000, min_timeout, max_timeout)
+
+def build_video_records(rows, default_channel, base_url=None, derive_thumbnails=False):
+    """Turn raw playlist rows into video records, dropping videos shorter than a minute.
+    
+    Thumbnails are built from the video ID when ``derive_thumbnails`` is set
+    (images were never loaded) or when the row has no lazily loaded ``src``.
+    """
+    base_url = base_url or get_base_url()
+    videos = []
+    for row in rows:
+        if not row.get("title") or not row.get("href"):
+            log.warning(f"Skipping playlist row without title or link: {row}")
+            continue
+        
+        video_info = {
+            "title": row["title"],
+            "url": f"{base_url}{row['href']}",
+            "channel": row.get("channel") or default_channel,
+            "thumbnail": None if derive_thumbnails else row.get("thumbnail") or None,
+        }
+        if video_info["thumbnail"] is None:
+            video_id = video_id_from_url(row["href"])
+            if video_id:
+                video_info["thumbnail"] = thumbnail_url(video_id)
+        
+        # Parse duration and filter videos
+        duration_text = row.get("duration")
+        if duration_text is None:
+            log.warning(f"Failed to get duration for '{video_info['title']}'")
+            continue  # Skip videos without duration
+        video_info["duration"] = duration_text
+        if parse_duration(duration_text) < 60:
+            log.debug(f"Skipping video '{video_info['title']}' due to duration: {duration_text}")
+            continue
+        
+        # Metadata line holds views and upload time
+        metadata = row.get("metadata") or []
+        if len(metadata) >= 2:
+            video_info["views"] = metadata[0]
+            video_info["upload_time"] = metadata[1]
+        
+        videos.append(video_info)
+    return videos
+
+def save_to_json(data, output_dir="output", filename=None):
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
     # Generate filename with timestamp
-    filename = f"youtube_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    if filename is None:
+        filename = f"youtube_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     filepath = os.path.join(output_dir, filename)
     
     with open(filepath, 'w', encoding='utf-8') as f:
@@ -46,220 +307,455 @@ def save_to_json(data, output_dir="output"):
     log.debug(f"Data saved to {filepath}")
     return filepath
 
-def scrape_youtube(course_name, output_dir="output"):
-    video_data = {
-        "playlist_info": {},
-        "videos": [],
-        "metadata": {
-            "scraped_at": datetime.now().isoformat(),
-            "url": ""
-        }
-    }
+class NdjsonWriter:
+    """Appends scrape events to a JSON Lines file as they arrive.
+    
+    Each line is ``{"type": <event>, "data": <payload>}`` and is flushed
+    immediately, so memory stays flat and partial results survive a crash.
+    """
+    
+    def __init__(self, output_dir="output", filename=None):
+        os.makedirs(output_dir, exist_ok=True)
+        if filename is None:
+            filename = f"youtube_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        self.path = os.path.join(output_dir, filename)
+        self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def write(self, kind, payload):
+        self._file.write(json.dumps({"type": kind, "data": payload}, ensure_ascii=False) + "\n")
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def collect_video_data(events):
+    """Assemble the events of a streaming scrape into the usual output structure."""
+    video_data = {"playlist_info": {}, "videos": [], "metadata": {}}
+    for kind, payload in events:
+        if kind == "video":
+            video_data["videos"].append(payload)
+        else:
+            video_data[kind] = payload
+    return video_data
+
+def iter_scrape_youtube_browser(course_name, search_url=None, block_resources=False, state_store=None, resolver=None,
+                                metrics=None, browser=None):
+    """Scrape the first playlist for ``course_name``, yielding results as they are extracted.
+    
+    Yields ``("playlist_info", info)`` once, then ``("video", record)`` for
+    each video as soon as its row has loaded, then ``("delta", delta)`` for
+    incremental scrapes and finally ``("metadata", metadata)``. Phase timings
+    and counters are recorded into ``metrics`` (a fresh ``ScrapeMetrics`` by
+    default) and reported under ``metadata["metrics"]`` unless it is disabled.
+    An already running ``browser`` (see ``browser_service``) is reused instead
+    of launching one; the scrape then only costs a fresh context.
+    """
+    metrics = metrics or ScrapeMetrics()
+    if browser is not None:
+        yield from iter_scrape_in_context(browser, course_name, search_url, block_resources, state_store, resolver, metrics)
+        return
 
+    # Imported here so the HTTP engine, the CLI and the app start without loading Playwright
+    from playwright.sync_api import sync_playwright
     with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+        with metrics.phase("browser_launch"):
+            browser = playwright.chromium.launch(headless=True)
         try:
-            # Get the playlist search URL
-            search_url = get_playlist_search_url(course_name)
-            video_data["metadata"]["url"] = search_url
-            
-            # Navigate directly to the playlist search results
-            page.goto(search_url)
-            
-            # Wait for the page to load completely
-            page.wait_for_load_state('networkidle')
-            page.wait_for_load_state('domcontentloaded')
-            
-            # Wait a bit for dynamic content to load
-            time.sleep(3)
-            
-            # Try different selectors for playlist items
-            selectors = [
-                'ytd-item-section-renderer ytd-lockup-view-model a.yt-lockup-metadata-view-model-wiz__title',
-                'ytd-item-section-renderer a#video-title',
-                'ytd-item-section-renderer a[href*="/playlist?list="]',
-                'ytd-item-section-renderer a[href*="&list="]'
-            ]
-            
-            first_playlist = None
-            for selector in selectors:
-                try:
-                    log.debug(f"Trying selector: {selector}")
-                    # Wait for any element matching the selector
-                    page.wait_for_selector(selector, timeout=5000)
-                    first_playlist = page.locator(selector).first
-                    if first_playlist.is_visible():
-                        log.debug(f"Found playlist with selector: {selector}")
-                        break
-                except Exception as e:
-                    log.debug(f"Selector {selector} failed: {e}")
-                    continue
-            
-            if not first_playlist:
-                raise Exception("Could not find any playlist items")
-            
-            # Get playlist information
-            video_title = first_playlist.text_content()
-            video_link = first_playlist.get_attribute('href')
-            
-            # Ensure we have a valid link
-            if not video_link or not ('/playlist?list=' in video_link or '&list=' in video_link):
-                raise Exception("Invalid playlist link found")
-            
-            # Get playlist title from search results using the correct selector
-            try:
-                playlist_title = page.locator('#contents > yt-lockup-view-model:nth-child(2) > div > div > yt-lockup-metadata-view-model > div.yt-lockup-metadata-view-model-wiz__text-container > h3').text_content()
-                video_data["playlist_info"]["title"] = playlist_title.strip()
-                log.debug(f"Found playlist title: {playlist_title}")
-            except Exception as e:
-                log.warning(f"Could not get playlist title from search results: {e}")
-                video_data["playlist_info"]["title"] = video_title.strip()
-            
-            # Click the playlist
-            first_playlist.click()
-            
-            # Wait for video page to load
-            page.wait_for_load_state('networkidle')
-            page.wait_for_load_state('domcontentloaded')
-            
-            # Get channel name
-            try:
-                channel_name = page.locator('ytd-channel-name yt-formatted-string a').first.text_content()
-                video_data["playlist_info"]["channel"] = channel_name.strip()
-            except Exception as e:
-                log.warning(f"Could not get channel name: {e}")
-                video_data["playlist_info"]["channel"] = "Unknown Channel"
-            
-            # Store playlist URL with full URL construction
-            video_data["playlist_info"]["url"] = f"https://www.youtube.com{video_link}"
-            
-            # Wait for playlist videos to load
-            page.wait_for_selector('#contents ytd-playlist-video-renderer', timeout=10000)
-            
-            # Scroll to load all thumbnails
-            log.debug("Starting to scroll to load all thumbnails...")
-            last_height = page.evaluate('document.documentElement.scrollHeight')
-            while True:
-                # Scroll down
-                page.evaluate('window.scrollTo(0, document.documentElement.scrollHeight)')
-                # Wait for new content to load
-                time.sleep(2)
-                
-                # Calculate new scroll height
-                new_height = page.evaluate('document.documentElement.scrollHeight')
-                
-                # Break if no more new content (height didn't change)
-                if new_height == last_height:
-                    break
-                    
-                last_height = new_height
-                log.debug(f"Scrolled to height: {new_height}")
-            
-            # Scroll back to top
-            page.evaluate('window.scrollTo(0, 0)')
-            time.sleep(1)  # Wait for any final loading
-            
-            # Get all playlist videos
-            video_items = page.locator('#contents ytd-playlist-video-renderer').all()
-            log.debug(f"Found {len(video_items)} videos in playlist")
-            
-            # Extract information for each video
-            for index, item in enumerate(video_items):
-                try:
-                    video_info = {}
-                    
-                    # Get video title
-                    title_element = item.locator('#video-title')
-                    video_info["title"] = title_element.text_content().strip()
-                    video_info["url"] = f"https://www.youtube.com{title_element.get_attribute('href')}"
-                    
-                    # Get channel name
-                    try:
-                        channel_element = item.locator('#channel-name #text')
-                        video_info["channel"] = channel_element.text_content().strip()
-                    except:
-                        video_info["channel"] = video_data["playlist_info"]["channel"]
-                    
-                    # Get thumbnail
-                    try:
-                        thumbnail_element = item.locator('ytd-thumbnail img')
-                        video_info["thumbnail"] = thumbnail_element.get_attribute('src')
-                    except:
-                        video_info["thumbnail"] = None
-                    
-                    # Get duration
-                    try:
-                        duration_element = item.locator('ytd-thumbnail-overlay-time-status-renderer .badge-shape-wiz__text')
-                        duration_text = duration_element.text_content().strip()
-                        video_info["duration"] = duration_text
-                        
-                        # Parse duration and filter videos
-                        duration_seconds = parse_duration(duration_text)
-                        if duration_seconds < 60 :
-                            log.debug(f"Skipping video '{video_info['title']}' due to duration: {duration_text}")
-                            continue
-                            
-                    except Exception as e:
-                        log.warning(f"Failed to get duration: {e}")
-                        video_info["duration"] = None
-                        continue  # Skip videos without duration
-                    
-                    # Get metadata (views and upload time)
-                    try:
-                        metadata_elements = item.locator('#metadata-line yt-formatted-string').all()
-                        if len(metadata_elements) >= 2:
-                            video_info["views"] = metadata_elements[0].text_content().strip()
-                            video_info["upload_time"] = metadata_elements[1].text_content().strip()
-                    except:
-                        video_info["views"] = None
-                        video_info["upload_time"] = None
-                    
-                    video_data["videos"].append(video_info)
-                    
-                    # Scroll after every 6th video
-                    if (index + 1) % 6 == 0 and index < len(video_items) - 1:
-                        log.debug(f"Scrolling after video {index + 1}")
-                        # Scroll to the next video
-                        item.scroll_into_view_if_needed()
-                        time.sleep(1)  # Wait for thumbnail to load
-                    
-                except Exception as e:
-                    log.warning(f"Failed to extract video info: {e}")
-                    continue
-            
-            # Print formatted data
-            print("\nPlaylist Information:")
-            print(json.dumps(video_data, indent=2, ensure_ascii=False))
-            
-            # Save to JSON file
-            output_file = save_to_json(video_data, output_dir)
-            print(f"\nData saved to: {output_file}")
-            
-            # Wait for demo purposes
-            page.wait_for_timeout(5000)
-            
-        except Exception as e:
-            log.error(f"Error: {e}")
-            raise e
+            yield from iter_scrape_in_context(browser, course_name, search_url, block_resources, state_store, resolver,
+                                              metrics)
         finally:
             browser.close()
 
+def iter_scrape_in_context(browser, course_name, search_url, block_resources, state_store, resolver, metrics):
+    """Body of ``iter_scrape_youtube_browser``, run in a new isolated context of ``browser``."""
+    video_data = new_video_data("browser")
+    with metrics.phase("context_setup"):
+        context = browser.new_context()
+        page = metrics.wrap(context.new_page())
+    blocker = None
+    if block_resources:
+        blocker = ResourceBlocker()
+        page.route("**/*", blocker.handle)
+    
+    try:
+        # Get the playlist search URL
+        search_url = search_url or get_playlist_search_url(course_name)
+        video_data["metadata"]["url"] = search_url
+        
+        # Navigate directly to the playlist search results
+        with metrics.phase("search_navigation"):
+            page.goto(search_url, wait_until='domcontentloaded')
+        
+        # Race the candidate selectors for playlist items
+        resolver = resolver or get_default_resolver()
+        with metrics.phase("selector_resolution"):
+            selector = resolver.resolve(page, "search_playlist_link", PLAYLIST_LINK_SELECTORS)
+        log.debug(f"Found playlist with selector: {selector}")
+        first_playlist = page.locator(f"{selector} >> visible=true").first
+        
+        # Get playlist information
+        with metrics.phase("selector_resolution"):
+            link_info = first_playlist.evaluate(PLAYLIST_LINK_INFO_JS)
+        video_link = link_info["href"]
+        
+        # Ensure we have a valid link
+        if not is_playlist_link(video_link):
+            raise Exception("Invalid playlist link found")
+        video_data["playlist_info"]["title"] = link_info["title"]
+        log.debug(f"Found playlist title: {link_info['title']}")
+        
+        # Click the playlist and wait for its rows to render
+        with metrics.phase("playlist_click"):
+            first_playlist.click()
+            page.wait_for_selector(PLAYLIST_ROW_SELECTOR, timeout=10000)
+        
+        # Get channel name
+        try:
+            with metrics.phase("selector_resolution"):
+                selector = resolver.resolve(page, "playlist_channel", CHANNEL_NAME_SELECTORS, timeout=5000)
+                channel_name = page.locator(f"{selector} >> visible=true").first.text_content()
+            video_data["playlist_info"]["channel"] = channel_name.strip()
+        except Exception as e:
+            log.warning(f"Could not get channel name: {e}")
+            video_data["playlist_info"]["channel"] = "Unknown Channel"
+        
+        # Store playlist URL with full URL construction
+        base_url = origin_of(search_url)
+        video_data["playlist_info"]["url"] = f"{base_url}{video_link}"
+        
+        yield "playlist_info", video_data["playlist_info"]
+        
+        # Scroll until every advertised video is loaded, or until the
+        # rows already known from the last scrape are reached
+        expected_count = page.evaluate(ADVERTISED_COUNT_JS)
+        log.debug(f"Playlist advertises {expected_count} videos")
+        row_ids = []
+        state = None
+        stop_when = None
+        if state_store:
+            from incremental import make_stop_check
+            state = state_store.load(video_data["playlist_info"]["url"])
+            stop_when = make_stop_check(state, expected_count, lambda: row_ids)
+        
+        # Extract each batch of rows in a single round-trip as it loads
+        videos = []
+        for rows in iter_playlist_row_batches(page, expected_count, stop_when=stop_when, metrics=metrics):
+            row_ids.extend(video_id_from_url(row.get("href")) for row in rows)
+            with metrics.phase("row_extraction"):
+                batch = build_video_records(rows, video_data["playlist_info"]["channel"], base_url, block_resources)
+            metrics.count("rows_seen", len(rows))
+            metrics.count("rows_skipped", len(rows) - len(batch))
+            for video in batch:
+                if state_store:
+                    videos.append(video)
+                yield "video", video
+        log.debug(f"Found {len(row_ids)} videos in playlist")
+        
+        if state_store:
+            from incremental import refresh_state
+            reused, delta, video_data["metadata"]["incremental"] = refresh_state(
+                state_store, video_data["playlist_info"]["url"], state, row_ids, videos, expected_count)
+            for video in reused:
+                yield "video", video
+            yield "delta", delta
+        
+        if blocker:
+            video_data["metadata"]["resource_blocking"] = blocker.report()
+            log.debug(f"Resource blocking: {video_data['metadata']['resource_blocking']}")
+        if metrics.enabled:
+            video_data["metadata"]["metrics"] = metrics.report()
+        yield "metadata", video_data["metadata"]
+        
+    except Exception as e:
+        log.error(f"Error: {e}")
+        raise e
+    finally:
+        context.close()
+
+def scrape_youtube_browser(course_name, search_url=None, block_resources=False, state_store=None, resolver=None,
+                           metrics=None, browser=None):
+    return collect_video_data(iter_scrape_youtube_browser(course_name, search_url, block_resources, state_store, resolver,
+                                                          metrics, browser))
+
+def iter_playlist_events(course_name, engine="browser", block_resources=False, state_store=None, metrics=None):
+    """Stream a scrape of the first playlist for ``course_name`` with the chosen engine.
+    
+    Yields the same events as ``iter_scrape_youtube_browser``. The HTTP engine
+    falls back to the browser if it fails before producing anything. With a
+    ``state_store`` the scrape is incremental: only rows not seen in the
+    previous scrape of the playlist are loaded, and a ``delta`` event follows
+    the merged snapshot.
+    """
+    if engine == "http":
+        # Imported lazily so the browser-only path doesn't need requests
+        from http_engine import iter_playlist_http, HttpEngineError
+        started = False
+        try:
+            for event in iter_playlist_http(course_name, state_store=state_store, metrics=metrics):
+                started = True
+                yield event
+            return
+        except HttpEngineError as e:
+            if started:
+                raise
+            log.warning(f"HTTP engine failed, falling back to browser: {e}")
+    
+    yield from iter_scrape_youtube_browser(course_name, block_resources=block_resources, state_store=state_store,
+                                           metrics=metrics)
+
+def fetch_playlist_data(course_name, engine="browser", block_resources=False, state_store=None, metrics=None):
+    """Scrape the first playlist for ``course_name`` with the chosen engine into one result."""
+    return collect_video_data(iter_playlist_events(course_name, engine, block_resources, state_store, metrics))
+
+def enrich_video_data(video_data, concurrency=8, checkpoint_path=None, metrics=None):
+    """Enrichment stage: add watch-page details to every video, checkpointed per playlist by default."""
+    from enrichment import enrich_videos, default_checkpoint_path
+    metrics = metrics or ScrapeMetrics(enabled=False)
+    checkpoint_path = checkpoint_path or default_checkpoint_path(video_data["playlist_info"]["url"])
+    with metrics.phase("enrichment"):
+        video_data["metadata"]["enrichment"] = enrich_videos(video_data["videos"], checkpoint_path, concurrency,
+                                                             metrics=metrics)
+    return video_data
+
+def scrape_youtube(course_name, output_dir="output", engine="browser", block_resources=False, cache=None, refresh=False,
+                   state_store=None, metrics=None, metrics_file=None, enrich=False, enrich_concurrency=8,
+                   enrich_checkpoint=None, output_format="json"):
+    metrics = metrics or ScrapeMetrics()
+    if cache is None:
+        video_data = fetch_playlist_data(course_name, engine, block_resources, state_store, metrics)
+    else:
+        from result_cache import get_or_scrape
+        # An incremental refresh must always reach the live playlist
+        video_data, from_cache = get_or_scrape(cache, course_name, get_playlist_search_url,
+                                               lambda: fetch_playlist_data(course_name, engine, block_resources, state_store, metrics),
+                                               refresh=refresh or state_store is not None)
+        stats = cache.stats()
+        print(f"Cache {'hit' if from_cache else 'miss'} (hits: {stats['hits']}, misses: {stats['misses']}, entries: {stats['entries']})")
+    
+    if enrich:
+        # After the cache so cached playlists get enriched too; the checkpoint avoids refetching
+        enrich_video_data(video_data, enrich_concurrency, enrich_checkpoint, metrics)
+        enrichment = video_data["metadata"]["enrichment"]
+        print(f"Enriched {enrichment['enriched']} videos ({enrichment['from_checkpoint']} from checkpoint, "
+              f"{enrichment['failed']} failed)")
+    
+    with metrics.phase("serialization"):
+        # Print formatted data
+        print("\nPlaylist Information:")
+        print(json.dumps(video_data, indent=2, ensure_ascii=False))
+        
+        # Save to JSON file, or one row per video with parsed numeric columns
+        if output_format == "json":
+            output_file = save_to_json(video_data, output_dir)
+        else:
+            from records import save_to_table
+            output_file = save_to_table(video_data, output_dir, output_format)
+    print(f"\nData saved to: {output_file}")
+    
+    if metrics_file and metrics.enabled:
+        metrics.write(metrics_file, labels={"engine": engine})
+    return video_data
+
+def stream_youtube(course_name, output_dir="output", engine="browser", block_resources=False, state_store=None,
+                   metrics=None, metrics_file=None):
+    """Scrape ``course_name`` and append every video to an NDJSON file as soon as it is extracted."""
+    metrics = metrics or ScrapeMetrics()
+    videos = 0
+    with NdjsonWriter(output_dir) as writer:
+        for kind, payload in iter_playlist_events(course_name, engine, block_resources, state_store, metrics):
+            with metrics.phase("serialization"):
+                writer.write(kind, payload)
+            if kind == "playlist_info":
+                print(f"Playlist: {payload['title']} ({payload['channel']})")
+            elif kind == "video":
+                videos += 1
+                print(f"  [{videos}] {payload['title']} ({payload['duration']})")
+    print(f"\n{videos} videos streamed to: {writer.path}")
+    
+    if metrics_file and metrics.enabled:
+        metrics.write(metrics_file, labels={"engine": engine})
+    return writer.path
+
+def run_batch_cli(args):
+    import asyncio
+    from batch_scraper import run_batch, read_course_list
+    
+    course_names = read_course_list(args.batch)
+    print(f"\nBatch: {len(course_names)} courses from {args.batch}")
+    print(f"Output directory: {args.output_dir}")
+    print(f"Concurrency: {args.concurrency} across {args.browsers} browser(s)\n")
+    
+    summary = asyncio.run(run_batch(course_names, args.output_dir, concurrency=args.concurrency, browsers=args.browsers,
+                                    min_interval=args.rate_limit, retries=args.retries,
+                                    block_resources=args.block_resources))
+    summary_file = save_to_json(summary, args.output_dir, f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    
+    print(f"\nSucceeded: {summary['succeeded']}/{summary['courses']}, videos: {summary['videos']}")
+    print(f"Elapsed: {summary['elapsed_seconds']}s ({summary['courses_per_minute']} courses/min)")
+    for course_name, error in summary["failures"].items():
+        print(f"  FAILED {course_name}: {error}")
+    print(f"Summary saved to: {summary_file}")
+    return 0 if summary["failed"] == 0 else 1
+
+def run_ranking_cli(args):
+    from playlist_ranking import rank_playlists
+    
+    print(f"\nRanking the top {args.top} playlists for: {args.course_name}\n")
+    video_data = rank_playlists(args.course_name, args.top, block_resources=args.block_resources)
+    for entry in video_data["metadata"]["ranking"]:
+        hours = entry["total_duration_seconds"] / 3600
+        print(f"  {entry['rank']}. [{entry['score']:.2f}] {entry['title']} ({entry['channel']}) - "
+              f"{entry['videos']} videos, {hours:.1f}h")
+    if args.enrich:
+        enrich_video_data(video_data, args.enrich_concurrency, args.enrich_checkpoint)
+    if args.format in ('csv', 'parquet'):
+        from records import save_to_table
+        output_file = save_to_table(video_data, args.output_dir, args.format)
+    else:
+        output_file = save_to_json(video_data, args.output_dir)
+    print(f"\nBest playlist: {video_data['playlist_info']['title']} ({video_data['metadata']['elapsed_seconds']}s)")
+    print(f"Data saved to: {output_file}")
+    return 0
+
+def run_server_cli(args):
+    from browser_service import BrowserService, make_server
+    
+    cache = None
+    if not args.no_cache:
+        from result_cache import ResultCache, DEFAULT_CACHE_PATH
+        cache = ResultCache(args.cache_path or DEFAULT_CACHE_PATH, ttl=args.cache_ttl * 3600, max_entries=args.cache_size)
+    service = BrowserService(size=args.browsers, max_uses=args.max_browser_uses)
+    server = make_server(service, args.host, args.port, cache=cache, block_resources=args.block_resources)
+    print(f"\nServing scrapes at http://{args.host}:{server.server_address[1]} with {args.browsers} warm browser(s)")
+    print("  GET /scrape?course=NAME[&stream=1][&refresh=1]    GET /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
 def main():
     parser = argparse.ArgumentParser(description='YouTube Playlist Scraper')
-    parser.add_argument('course_name', type=str, help='Name of the course to search for')
+    parser.add_argument('course_name', type=str, nargs='?', help='Name of the course to search for')
     parser.add_argument('--output-dir', type=str, default='output', help='Directory to save JSON output (default: output)')
     parser.add_argument('--headless', action='store_true', help='Run browser in headless mode')
+    parser.add_argument('--engine', choices=['browser', 'http'], default='browser',
+                        help='Scraping engine; "http" parses page JSON without a browser and falls back to it on failure (default: browser)')
+    parser.add_argument('--block-resources', action='store_true',
+                        help='Abort image, media, font and tracking requests in the browser and report what was saved')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'csv', 'parquet'], default='json',
+                        help='Output format; "ndjson" streams each video to a .jsonl file as it is extracted and skips the cache, '
+                             '"csv" and "parquet" write one row per video with numeric duration, views and date (default: json)')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the on-disk result cache')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached results but store the fresh scrape')
+    parser.add_argument('--cache-path', type=str, default=None, help='SQLite result cache file (default: .cache/results.sqlite3)')
+    parser.add_argument('--cache-ttl', type=float, default=24, help='Hours a cached result stays valid (default: 24)')
+    parser.add_argument('--cache-size', type=int, default=500, help='Maximum cached queries before LRU eviction (default: 500)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only fetch videos not seen in the previous scrape of the playlist and output a delta')
+    parser.add_argument('--state-path', type=str, default=None,
+                        help='SQLite file remembering scraped playlists for --incremental (default: .cache/playlists.sqlite3)')
+    parser.add_argument('--base-url', type=str, default=None,
+                        help='Origin to scrape instead of https://www.youtube.com, e.g. a local fixture server')
+    parser.add_argument('--no-metrics', action='store_true', help='Disable per-phase timing instrumentation')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='Also write scrape metrics to this file (Prometheus text for .prom, JSON otherwise)')
+    parser.add_argument('--selector-stats', action='store_true',
+                        help='Print per-selector hit and latency statistics and exit')
+    parser.add_argument('--batch', type=str, metavar='FILE', help='Scrape every course listed in FILE (one per line) concurrently')
+    parser.add_argument('--concurrency', type=int, default=4, help='Courses scraped at once in batch mode (default: 4)')
+    parser.add_argument('--browsers', type=int, default=1,
+                        help='Long-lived browsers shared by batch workers or --serve requests (default: 1)')
+    parser.add_argument('--rate-limit', type=float, default=1.0, help='Minimum seconds between requests to the same host in batch mode (default: 1.0)')
+    parser.add_argument('--retries', type=int, default=2, help='Retries per course in batch mode (default: 2)')
+    parser.add_argument('--enrich', action='store_true',
+                        help='Fetch each video page for description, chapters, publish date and likes (not with --format ndjson)')
+    parser.add_argument('--enrich-concurrency', type=int, default=8, help='Video pages fetched at once by --enrich (default: 8)')
+    parser.add_argument('--enrich-checkpoint', type=str, default=None,
+                        help='JSONL file that makes --enrich resumable (default: .cache/enrichment/<playlist id>.jsonl)')
+    parser.add_argument('--top', type=int, default=1, metavar='N',
+                        help='Scrape the top N playlist results concurrently and keep the best-ranked one '
+                             '(browser only, uncached, no --batch, --serve, --incremental, metrics or ndjson)')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run as an HTTP daemon answering scrape requests from warm browsers')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Address --serve listens on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port --serve listens on (default: 8080)')
+    parser.add_argument('--max-browser-uses', type=int, default=50,
+                        help='Scrapes served by a browser before --serve relaunches it (default: 50)')
     
     args = parser.parse_args()
+    if args.base_url:
+        os.environ["YOUTUBE_BASE_URL"] = args.base_url
+    if args.selector_stats:
+        print(json.dumps(get_default_resolver().stats(), indent=2))
+        return 0
+    if not args.course_name and not args.batch and not args.serve:
+        parser.error('either course_name, --batch or --serve is required')
+    if args.enrich and args.format == 'ndjson':
+        parser.error('--enrich does not work with --format ndjson')
+    if args.top < 1:
+        parser.error('--top must be at least 1')
+    if args.top > 1:
+        # Ranking is its own concurrent browser pass, outside the engine, incremental and metrics pipeline
+        unsupported = [flag for flag, used in (
+            ("--batch", args.batch), ("--serve", args.serve), ("--engine http", args.engine == 'http'), ("--incremental", args.incremental),
+            ("--format ndjson", args.format == 'ndjson'), ("--no-metrics", args.no_metrics),
+            ("--metrics-file", args.metrics_file),
+        ) if used]
+        if unsupported:
+            parser.error(f"--top does not work with {', '.join(unsupported)}")
+    
+    # A stamp lookup once postinstall.sh has run; the HTTP engine only needs
+    # the browser for its fallback, which reports a missing one itself
+    if args.serve or args.batch or args.top > 1 or args.engine == 'browser':
+        from startup import ensure_browser, BrowserNotInstalledError
+        try:
+            ensure_browser()
+        except BrowserNotInstalledError as e:
+            print(f"Error: {e}")
+            return 1
+    
+    if args.serve:
+        return run_server_cli(args)
+    if args.batch:
+        return run_batch_cli(args)
+    if args.top > 1:
+        return run_ranking_cli(args)
     
     try:
         print(f"\nSearching for: {args.course_name}")
         print(f"Output directory: {args.output_dir}")
         print("Starting scraper...\n")
         
-        scrape_youtube(args.course_name, args.output_dir)
+        state_store = None
+        if args.incremental:
+            from incremental import PlaylistStateStore, DEFAULT_STATE_PATH
+            state_store = PlaylistStateStore(args.state_path or DEFAULT_STATE_PATH)
+        
+        metrics = ScrapeMetrics(enabled=not args.no_metrics)
+        if args.format == 'ndjson':
+            stream_youtube(args.course_name, args.output_dir, engine=args.engine, block_resources=args.block_resources,
+                           state_store=state_store, metrics=metrics, metrics_file=args.metrics_file)
+            return 0
+        
+        cache = None
+        if not args.no_cache:
+            from result_cache import ResultCache, DEFAULT_CACHE_PATH
+            cache = ResultCache(args.cache_path or DEFAULT_CACHE_PATH, ttl=args.cache_ttl * 3600, max_entries=args.cache_size)
+        
+        scrape_youtube(args.course_name, args.output_dir, engine=args.engine, block_resources=args.block_resources,
+                       cache=cache, refresh=args.refresh, state_store=state_store, metrics=metrics,
+                       metrics_file=args.metrics_file, enrich=args.enrich, enrich_concurrency=args.enrich_concurrency,
+                       enrich_checkpoint=args.enrich_checkpoint, output_format=args.format)
         
     except Exception as e:
         print(f"\nError: {e}")
@@ -1,12 +1,10 @@
-import os
+import time
 
-# Ensure Playwright and its dependencies are installed on Streamlit Cloud
-os.system("playwright install chromium")
-os.system("playwright install-deps")
+# Streamlit re-executes this script on every interaction; time each run
+script_start = time.perf_counter()
 
 import streamlit as st
 import json
-import os
 from datetime import datetime
 
 # --- Windows asyncio event loop fix for Playwright ---
@@ -15,128 +13,76 @@ if sys.platform.startswith("win"):
     import asyncio
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-from Youtube_scraperV3 import get_playlist_search_url, parse_duration
-from playwright.sync_api import sync_playwright
+import urllib.parse
 
-# --- Helper function (refactored from Youtube_scraperV3.py) ---
-def scrape_youtube_streamlit(course_name):
+from Youtube_scraperV3 import collect_video_data, get_base_url
+from browser_service import BrowserService
+from job_queue import JobQueue
+from result_cache import ResultCache, normalize_query
+from startup import BrowserNotInstalledError, ensure_browser, record_render
+
+SCRAPE_WORKERS = 1  # browsers, and so scrapes running at once
+MAX_PENDING_SCRAPES = 8  # scrapes allowed to wait for a browser
+POLL_INTERVAL = 1.0  # seconds between progress refreshes of a running scrape
+PROGRESS_PREVIEW = 20  # videos shown while a scrape is still running
+
+# --- Helper functions (refactored from Youtube_scraperV3.py) ---
+def get_streamlit_search_url(course_name):
     # Improve English targeting in search
     modified_course_name = f"{course_name} in english in English -hindi -हिन्दी -हिंदी"
-    from Youtube_scraperV3 import get_playlist_search_url as orig_get_playlist_search_url
-    def get_playlist_search_url(course_name):
-        import urllib.parse
-        encoded_course = urllib.parse.quote(modified_course_name)
-        return f"https://www.youtube.com/results?search_query={encoded_course}&sp=EgIQAw%253D%253D"
-
-    video_data = {
-        "playlist_info": {},
-        "videos": [],
-        "metadata": {
-            "scraped_at": datetime.now().isoformat(),
-            "url": ""
-        }
-    }
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=True)
-        page = browser.new_page()
-        try:
-            search_url = get_playlist_search_url(course_name)
-            video_data["metadata"]["url"] = search_url
-            page.goto(search_url)
-            page.wait_for_load_state('networkidle')
-            page.wait_for_load_state('domcontentloaded')
-            # Wait for dynamic content
-            import time
-            time.sleep(3)
-            # Try selectors for playlist
-            selectors = [
-                'ytd-item-section-renderer ytd-lockup-view-model a.yt-lockup-metadata-view-model-wiz__title',
-                'ytd-item-section-renderer a#video-title',
-                'ytd-item-section-renderer a[href*="/playlist?list="]',
-                'ytd-item-section-renderer a[href*="&list="]'
-            ]
-            first_playlist = None
-            for selector in selectors:
-                try:
-                    page.wait_for_selector(selector, timeout=5000)
-                    first_playlist = page.locator(selector).first
-                    if first_playlist.is_visible():
-                        break
-                except:
-                    continue
-            if not first_playlist:
-                raise Exception("Could not find any playlist items")
-            video_title = first_playlist.text_content()
-            video_link = first_playlist.get_attribute('href')
-            if not video_link or not ('/playlist?list=' in video_link or '&list=' in video_link):
-                raise Exception("Invalid playlist link found")
-            try:
-                playlist_title = page.locator('#contents > yt-lockup-view-model:nth-child(2) > div > div > yt-lockup-metadata-view-model > div.yt-lockup-metadata-view-model-wiz__text-container > h3').text_content()
-                video_data["playlist_info"]["title"] = playlist_title.strip()
-            except:
-                video_data["playlist_info"]["title"] = video_title.strip()
-            first_playlist.click()
-            page.wait_for_load_state('networkidle')
-            page.wait_for_load_state('domcontentloaded')
-            try:
-                channel_name = page.locator('ytd-channel-name yt-formatted-string a').first.text_content()
-                video_data["playlist_info"]["channel"] = channel_name.strip()
-            except:
-                video_data["playlist_info"]["channel"] = "Unknown Channel"
-            video_data["playlist_info"]["url"] = f"https://www.youtube.com{video_link}"
-            page.wait_for_selector('#contents ytd-playlist-video-renderer', timeout=10000)
-            # Scroll to load all thumbnails
-            last_height = page.evaluate('document.documentElement.scrollHeight')
-            while True:
-                page.evaluate('window.scrollTo(0, document.documentElement.scrollHeight)')
-                time.sleep(2)
-                new_height = page.evaluate('document.documentElement.scrollHeight')
-                if new_height == last_height:
-                    break
-                last_height = new_height
-            page.evaluate('window.scrollTo(0, 0)')
-            time.sleep(1)
-            video_items = page.locator('#contents ytd-playlist-video-renderer').all()
-            for index, item in enumerate(video_items):
-                try:
-                    video_info = {}
-                    title_element = item.locator('#video-title')
-                    video_info["title"] = title_element.text_content().strip()
-                    video_info["url"] = f"https://www.youtube.com{title_element.get_attribute('href')}"
-                    try:
-                        channel_element = item.locator('#channel-name #text')
-                        video_info["channel"] = channel_element.text_content().strip()
-                    except:
-                        video_info["channel"] = video_data["playlist_info"]["channel"]
-                    try:
-                        thumbnail_element = item.locator('ytd-thumbnail img')
-                        video_info["thumbnail"] = thumbnail_element.get_attribute('src')
-                    except:
-                        video_info["thumbnail"] = None
-                    try:
-                        duration_element = item.locator('ytd-thumbnail-overlay-time-status-renderer .badge-shape-wiz__text')
-                        duration_text = duration_element.text_content().strip()
-                        video_info["duration"] = duration_text
-                        duration_seconds = parse_duration(duration_text)
-                        if duration_seconds < 60:
-                            continue
-                    except:
-                        video_info["duration"] = None
-                        continue
-                    try:
-                        metadata_elements = item.locator('#metadata-line yt-formatted-string').all()
-                        if len(metadata_elements) >= 2:
-                            video_info["views"] = metadata_elements[0].text_content().strip()
-                            video_info["upload_time"] = metadata_elements[1].text_content().strip()
-                    except:
-                        video_info["views"] = None
-                        video_info["upload_time"] = None
-                    video_data["videos"].append(video_info)
-                except:
-                    continue
-            return video_data
-        finally:
-            browser.close()
+    encoded_course = urllib.parse.quote(modified_course_name)
+    return f"{get_base_url()}/results?search_query={encoded_course}&sp=EgIQAw%253D%253D"
+
+def iter_scrape_youtube_streamlit(course_name, service=None):
+    # Thumbnails are rendered from URLs derived from the video ID, so the
+    # browser never needs to download images, fonts or media
+    service = service or get_browser_service()
+    return service.iter_scrape(course_name, search_url=get_streamlit_search_url(course_name), block_resources=True)
+
+def scrape_youtube_streamlit(course_name):
+    return collect_video_data(iter_scrape_youtube_streamlit(course_name))
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+@st.cache_resource
+def check_browser():
+    # Once per server process: a stamp lookup normally, a guarded one-time
+    # install on a fresh machine (system libraries come from packages.txt).
+    # Failures are cached too, so reruns don't retry the install.
+    try:
+        return ensure_browser(install=True), None
+    except Exception as e:
+        return None, str(e)
+
+@st.cache_resource
+def get_browser_service():
+    # Warm Chromium shared by every session; each scrape gets its own context
+    _, error = check_browser()
+    if error:
+        raise BrowserNotInstalledError(error)
+    return BrowserService(size=SCRAPE_WORKERS)
+
+@st.cache_resource
+def get_job_queue():
+    # One worker per browser; scrapes beyond that wait in a bounded queue
+    return JobQueue(workers=SCRAPE_WORKERS, max_pending=MAX_PENDING_SCRAPES)
+
+@st.cache_resource
+def get_render_stats():
+    return {"runs": 0}
+
+def submit_scrape(course_name, query, search_url, cache):
+    """Queue a background scrape (or join the one already running for the query) and return its job ID."""
+    # Resolved here, on the script thread, so a missing browser is reported at once
+    service = get_browser_service()
+    if not service.alive():
+        # Its workers died (e.g. Playwright failed); start a fresh service
+        get_browser_service.clear()
+        service = get_browser_service()
+    return get_job_queue().submit(query, lambda: iter_scrape_youtube_streamlit(course_name, service),
+                                  on_done=lambda result: cache.put(query, search_url, result))
 
 # --- Streamlit UI ---
 st.set_page_config(page_title="YouTube Playlist Scraper", layout="wide")
@@ -144,35 +90,99 @@ st.title("YouTube Playlist Scraper")
 st.write("Enter a course name to search for related YouTube playlists and extract video details.")
 
 course_name = st.text_input("Course Name", "")
+refresh = st.checkbox("Ignore cached results", value=False)
 run_btn = st.button("Scrape Playlist")
 
+def render_playlist_info(playlist_info):
+    st.subheader("Playlist Information")
+    st.json(playlist_info)
+    st.subheader("Videos")
+
+def render_video(vid):
+    with st.expander(vid.get("title", "No Title")):
+        st.write(f"**URL**: {vid.get('url', 'N/A')}")
+        st.write(f"**Channel**: {vid.get('channel', 'N/A')}")
+        st.write(f"**Duration**: {vid.get('duration', 'N/A')}")
+        st.write(f"**Views**: {vid.get('views', 'N/A')}")
+        st.write(f"**Upload Time**: {vid.get('upload_time', 'N/A')}")
+        if vid.get("thumbnail"):
+            st.image(vid["thumbnail"], width=320)
+
+def render_videos(videos):
+    for vid in videos:
+        render_video(vid)
+
+def render_job_progress(job):
+    if job["status"] == "queued":
+        st.info(f"Waiting for a free browser... (position {job['position']} in the queue)")
+        return
+    st.info(f"Scraping YouTube playlist... {len(job['videos'])} videos so far")
+    if job["playlist_info"]:
+        render_playlist_info(job["playlist_info"])
+        # Only the latest videos while polling; the full list renders once the job is done
+        render_videos(job["videos"][-PROGRESS_PREVIEW:])
+
 result_data = None
 error = None
+cache = get_result_cache()
 
 if run_btn and course_name.strip():
-    with st.spinner("Scraping YouTube playlist... (this may take up to a minute)"):
+    query = normalize_query(course_name)
+    search_url = get_streamlit_search_url(query)
+    st.session_state.pop("job_id", None)
+    result_data = None if refresh else cache.get(query, search_url)
+    if result_data:
+        st.success(f"Served from cache (scraped at {result_data['metadata']['scraped_at']})")
+    else:
         try:
-            result_data = scrape_youtube_streamlit(course_name.strip())
+            st.session_state["job_id"] = submit_scrape(course_name.strip(), query, search_url, cache)
         except Exception as e:
             error = str(e)
 
+job = get_job_queue().get(st.session_state["job_id"]) if "job_id" in st.session_state else None
+polling = job is not None and job["status"] in ("queued", "running")
+if polling:
+    render_job_progress(job)
+elif job and job["status"] == "done":
+    result_data = job["result"]
+    st.success(f"Scraping complete! {len(result_data['videos'])} videos")
+elif job and job["status"] == "failed":
+    error = job["error"]
+    st.session_state.pop("job_id")
+
 if error:
     st.error(f"Error: {error}")
 
 if result_data:
-    st.success("Scraping complete!")
-    st.subheader("Playlist Information")
-    st.json(result_data["playlist_info"])
-    st.subheader("Videos")
-    for vid in result_data["videos"]:
-        with st.expander(vid.get("title", "No Title")):
-            st.write(f"**URL**: {vid.get('url', 'N/A')}")
-            st.write(f"**Channel**: {vid.get('channel', 'N/A')}")
-            st.write(f"**Duration**: {vid.get('duration', 'N/A')}")
-            st.write(f"**Views**: {vid.get('views', 'N/A')}")
-            st.write(f"**Upload Time**: {vid.get('upload_time', 'N/A')}")
-            if vid.get("thumbnail"):
-                st.image(vid["thumbnail"], width=320)
+    render_playlist_info(result_data["playlist_info"])
+    render_videos(result_data["videos"])
     st.subheader("Download JSON")
     json_str = json.dumps(result_data, indent=2, ensure_ascii=False)
     st.download_button("Download Results as JSON", data=json_str, file_name=f"youtube_playlist_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", mime="application/json")
+    if result_data["metadata"].get("metrics"):
+        with st.expander("Scrape metrics"):
+            st.json(result_data["metadata"]["metrics"])
+
+cache_stats = cache.stats()
+st.caption(f"Result cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries")
+
+job_stats = get_job_queue().stats()
+st.caption(f"Scrape queue: {job_stats['running']} running, {job_stats['pending']} waiting")
+
+render_stats = get_render_stats()
+render_ms = (time.perf_counter() - script_start) * 1000
+if not polling:
+    record_render(render_ms, first_in_process=render_stats["runs"] == 0)
+render_stats["runs"] += 1
+st.caption(f"Rendered in {render_ms:.0f} ms")
+
+# Warm the browser only after the page has been sent, so a first-time
+# install or launch never delays the first render
+try:
+    get_browser_service()
+except Exception as e:
+    st.warning(f"Browser unavailable: {e}")
+
+if polling:
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
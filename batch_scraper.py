@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import random
+import re
+import time
+import urllib.parse
+from datetime import datetime
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from result_cache import normalize_query
+from selector_resolver import get_default_resolver
+from Youtube_scraperV3 import (
+    PLAYLIST_LINK_SELECTORS, CHANNEL_NAME_SELECTORS, PLAYLIST_ROW_SELECTOR, PLAYLIST_LINK_INFO_JS,
+    PLAYLIST_ROWS_JS, ROW_GROWTH_JS, ROW_COUNT_JS, ADVERTISED_COUNT_JS, SCROLL_TO_BOTTOM_JS, next_growth_timeout,
+    ResourceBlocker, get_playlist_search_url, origin_of, is_playlist_link, new_video_data, build_video_records,
+    save_to_json,
+)
+
+log = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """Spaces out navigations so each host sees at most one request per ``min_interval`` seconds."""
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._locks = {}
+        self._last = {}
+
+    async def wait(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            delay = self._last.get(host, 0) + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last[host] = time.monotonic()
+
+
+class BrowserPool:
+    """A fixed set of long-lived browsers handing out one isolated context per course."""
+
+    def __init__(self, playwright, size=1):
+        self.playwright = playwright
+        self.size = size
+        self.browsers = []
+        self._next = 0
+
+    async def start(self):
+        for _ in range(self.size):
+            self.browsers.append(await self.playwright.chromium.launch(headless=True))
+        return self
+
+    async def new_context(self):
+        browser = self.browsers[self._next % len(self.browsers)]
+        self._next += 1
+        return await browser.new_context()
+
+    async def close(self):
+        for browser in self.browsers:
+            await browser.close()
+        self.browsers = []
+
+
+async def load_playlist_rows_async(page, expected_count=None, min_timeout=2000, max_timeout=10000):
+    """Async counterpart of the scrolling in ``iter_playlist_row_batches``; returns the loaded row count."""
+    count = await page.evaluate(ROW_GROWTH_JS, [PLAYLIST_ROW_SELECTOR, 0]) or 0
+    timeout = min_timeout
+    while not (expected_count and count >= expected_count):
+        await page.evaluate(SCROLL_TO_BOTTOM_JS)
+        start = time.monotonic()
+        try:
+            handle = await page.wait_for_function(ROW_GROWTH_JS, arg=[PLAYLIST_ROW_SELECTOR, count], timeout=timeout)
+            count = await handle.json_value()
+        except PlaywrightTimeoutError:
+            # Step past rows that never filled in and keep loading the rest
+            loaded = await page.evaluate(ROW_COUNT_JS)
+            if loaded > count:
+                count = loaded
+                continue
+            if expected_count:
+                log.warning(f"Playlist advertises {expected_count} videos but no more rows loaded after {count}")
+            break
+        timeout = next_growth_timeout((time.monotonic() - start) * 1000, min_timeout, max_timeout)
+    return count
+
+
+async def scrape_course_async(page, course_name, limiter, derive_thumbnails=False):
+    """Async counterpart of ``scrape_youtube_browser`` running on an existing page."""
+    search_url = get_playlist_search_url(course_name)
+    video_data = new_video_data("browser", search_url)
+
+    await limiter.wait(search_url)
+    await page.goto(search_url, wait_until='domcontentloaded')
+
+    resolver = get_default_resolver()
+    selector = await resolver.resolve_async(page, "search_playlist_link", PLAYLIST_LINK_SELECTORS)
+    first_playlist = page.locator(f"{selector} >> visible=true").first
+
+    link_info = await first_playlist.evaluate(PLAYLIST_LINK_INFO_JS)
+    video_link = link_info["href"]
+    if not is_playlist_link(video_link):
+        raise Exception("Invalid playlist link found")
+    video_data["playlist_info"]["title"] = link_info["title"]
+
+    await limiter.wait(search_url)
+    await first_playlist.click()
+    await page.wait_for_selector(PLAYLIST_ROW_SELECTOR, timeout=10000)
+
+    base_url = origin_of(search_url)
+    video_data["playlist_info"]["url"] = f"{base_url}{video_link}"
+    video_data["playlist_info"]["channel"], video_data["videos"] = await read_playlist_async(
+        page, resolver, base_url, derive_thumbnails, label=course_name)
+    return video_data
+
+
+async def read_playlist_async(page, resolver, base_url, derive_thumbnails=False, label=""):
+    """Read the owner and every video of the playlist open in ``page``; returns ``(channel, videos)``."""
+    try:
+        selector = await resolver.resolve_async(page, "playlist_channel", CHANNEL_NAME_SELECTORS, timeout=5000)
+        channel = (await page.locator(f"{selector} >> visible=true").first.text_content()).strip()
+    except Exception as e:
+        log.warning(f"[{label}] Could not get channel name: {e}")
+        channel = "Unknown Channel"
+
+    await load_playlist_rows_async(page, await page.evaluate(ADVERTISED_COUNT_JS))
+
+    rows = await page.eval_on_selector_all(PLAYLIST_ROW_SELECTOR, PLAYLIST_ROWS_JS)
+    log.debug(f"[{label}] Found {len(rows)} videos in playlist")
+    return channel, build_video_records(rows, channel, base_url, derive_thumbnails)
+
+
+def course_filename(course_name):
+    """Per-course output filename, unique even when several courses finish in the same second."""
+    slug = re.sub(r'[^a-z0-9]+', '_', course_name.lower()).strip('_')[:60] or "course"
+    return f"youtube_data_{slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+
+async def run_batch(course_names, output_dir="output", concurrency=4, browsers=1,
+                    min_interval=1.0, retries=2, backoff=2.0, block_resources=False):
+    """Scrape many courses concurrently and write one JSON file per course.
+
+    Up to ``concurrency`` courses run at once, each in its own context on a
+    pool of ``browsers`` long-lived browsers. Failed courses are retried with
+    exponential backoff. With ``block_resources`` each context aborts
+    images, media, fonts and trackers. Returns a summary of throughput and
+    failures.
+    """
+    limiter = HostRateLimiter(min_interval)
+    semaphore = asyncio.Semaphore(concurrency)
+    summary = {
+        "started_at": datetime.now().isoformat(),
+        "courses": len(course_names),
+        "succeeded": 0,
+        "failed": 0,
+        "videos": 0,
+        "outputs": {},
+        "failures": {},
+    }
+
+    async def worker(pool, course_name):
+        async with semaphore:
+            for attempt in range(retries + 1):
+                context = await pool.new_context()
+                blocker = None
+                try:
+                    if block_resources:
+                        blocker = ResourceBlocker()
+                        await context.route("**/*", blocker.handle_async)
+                    page = await context.new_page()
+                    video_data = await scrape_course_async(page, course_name, limiter, derive_thumbnails=block_resources)
+                    if blocker:
+                        video_data["metadata"]["resource_blocking"] = blocker.report()
+                    summary["outputs"][course_name] = save_to_json(video_data, output_dir, course_filename(course_name))
+                    summary["succeeded"] += 1
+                    summary["videos"] += len(video_data["videos"])
+                    log.info(f"[{course_name}] {len(video_data['videos'])} videos")
+                    return
+                except Exception as e:
+                    if attempt == retries:
+                        log.error(f"[{course_name}] Giving up after {attempt + 1} attempts: {e}")
+                        summary["failed"] += 1
+                        summary["failures"][course_name] = str(e)
+                        return
+                    delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+                    log.warning(f"[{course_name}] Attempt {attempt + 1} failed ({e}), retrying in {delay:.1f}s")
+                finally:
+                    await context.close()
+                # Back off only once the failed attempt's context is closed
+                await asyncio.sleep(delay)
+
+    start = time.monotonic()
+    async with async_playwright() as playwright:
+        pool = await BrowserPool(playwright, browsers).start()
+        try:
+            await asyncio.gather(*(worker(pool, name) for name in course_names))
+        finally:
+            await pool.close()
+
+    elapsed = time.monotonic() - start
+    summary["elapsed_seconds"] = round(elapsed, 2)
+    summary["courses_per_minute"] = round(summary["succeeded"] * 60 / elapsed, 2) if elapsed else None
+    return summary
+
+
+def read_course_list(path):
+    """Read course names from a text file, one per line, skipping blanks, # comments and repeats.
+
+    Names that only differ in case or spacing are the same search, so only
+    the first of them is kept.
+    """
+    with open(path, encoding='utf-8') as f:
+        names = [line.strip() for line in f]
+    courses, seen = [], set()
+    for name in names:
+        if not name or name.startswith('#'):
+            continue
+        query = normalize_query(name)
+        if query in seen:
+            log.warning(f"Skipping repeated course '{name}'")
+            continue
+        seen.add(query)
+        courses.append(name)
+    return courses
@@ -0,0 +1,115 @@
+"""Serves a fixture directory (see ``benchmarks.fixtures``) as a local YouTube stand-in.
+
+Point the scraper at it with ``--base-url`` or ``YOUTUBE_BASE_URL``:
+
+    python -m benchmarks.fixture_server --port 8765
+    python Youtube_scraperV3.py "medium course" --base-url http://127.0.0.1:8765
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import write_fixtures
+
+log = logging.getLogger(__name__)
+
+# Served for every thumbnail so image loading costs something when not blocked
+THUMBNAIL_BYTES = b"\xff\xd8\xff\xe0" + b"\x00" * 12_000 + b"\xff\xd9"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    fixtures_dir = None
+    cases = {}
+
+    def log_message(self, format, *args):
+        log.debug(f"{self.address_string()} {format % args}")
+
+    def case_for_playlist(self, query):
+        list_id = query.get("list", [""])[0]
+        return next((case for case, info in self.cases.items() if info["playlist_id"] == list_id), None)
+
+    def case_for_search(self, query):
+        words = query.get("search_query", [""])[0].lower().split()
+        return next((case for case in self.cases if case in words), None)
+
+    def send(self, status, body, content_type="text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_fixture(self, case, name, content_type="text/html; charset=utf-8"):
+        path = os.path.join(self.fixtures_dir, case, name) if case else None
+        if not path or not os.path.exists(path):
+            self.send(404, b"not found", "text/plain")
+            return
+        with open(path, "rb") as f:
+            self.send(200, f.read(), content_type)
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parts.query)
+        if parts.path == "/results":
+            self.send_fixture(self.case_for_search(query), "search.html")
+        elif parts.path == "/playlist":
+            self.send_fixture(self.case_for_playlist(query), "playlist.html")
+        elif parts.path == "/bench/rows":
+            start = int(query.get("start", ["0"])[0])
+            self.send_fixture(self.case_for_playlist(query), f"rows_{start}.html")
+        elif parts.path.startswith("/vi/"):
+            self.send(200, THUMBNAIL_BYTES, "image/jpeg")
+        else:
+            self.send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+        if urllib.parse.urlsplit(self.path).path != "/youtubei/v1/browse":
+            self.send(404, b"not found", "text/plain")
+            return
+        try:
+            case, start = json.loads(body)["continuation"].rsplit(":", 1)
+        except (ValueError, KeyError):
+            self.send(400, b"bad continuation", "text/plain")
+            return
+        self.send_fixture(case if case in self.cases else None, f"continuation_{start}.json", "application/json")
+
+
+def start_fixture_server(fixtures_dir=None, port=0):
+    """Serve ``fixtures_dir`` (freshly generated fixtures by default) on a background thread.
+
+    Returns ``(server, base_url)``; call ``server.shutdown()`` when done.
+    """
+    fixtures_dir = fixtures_dir or write_fixtures(tempfile.mkdtemp(prefix="yt-fixtures-"))
+    with open(os.path.join(fixtures_dir, "index.json"), encoding="utf-8") as f:
+        cases = json.load(f)
+    handler = type("Handler", (FixtureHandler,), {"fixtures_dir": fixtures_dir, "cases": cases})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    log.debug(f"Serving fixtures from {fixtures_dir} at {base_url}")
+    return server, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve offline YouTube fixture pages')
+    parser.add_argument('--fixtures-dir', type=str, help='Fixture directory (default: generate into a temp dir)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    args = parser.parse_args()
+    server, base_url = start_fixture_server(args.fixtures_dir, args.port)
+    print(f"Serving fixtures at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
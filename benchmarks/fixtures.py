@@ -0,0 +1,201 @@
+"""Offline stand-ins for the YouTube pages the scraper reads.
+
+A fixture directory holds one sub-directory per case plus an ``index.json``
+mapping each case to its playlist ID::
+
+    index.json
+    <case>/search.html             search results (DOM + ytInitialData)
+    <case>/playlist.html           first 100 playlist rows (DOM + ytInitialData)
+    <case>/rows_<start>.html       rows appended by infinite scroll (Playwright engine)
+    <case>/continuation_<start>.json  InnerTube continuation responses (HTTP engine)
+
+The generated pages reproduce the markup and JSON paths the scraper relies
+on; recorded pages laid out the same way can be dropped in instead.
+
+    python -m benchmarks.fixtures --out benchmarks/data
+"""
+import argparse
+import html
+import json
+import os
+
+# Case name -> number of videos in the playlist
+CASES = {"small": 20, "medium": 200, "large": 2000}
+PAGE_SIZE = 100
+CHANNEL = "Bench Academy"
+
+STYLE = """
+<style>
+  ytd-playlist-video-renderer { display: block; height: 90px; }
+  ytd-thumbnail img { width: 120px; height: 68px; }
+</style>
+"""
+
+# Appends the next batch of rows when the page is scrolled to the bottom,
+# like YouTube's continuation loading
+SCROLL_SCRIPT = """
+<script>
+  let loaded = %(loaded)d, busy = false;
+  const total = %(total)d;
+  window.addEventListener('scroll', () => {
+    if (busy || loaded >= total) return;
+    if (window.innerHeight + window.scrollY < document.documentElement.scrollHeight - 200) return;
+    busy = true;
+    fetch('/bench/rows?list=%(playlist_id)s&start=' + loaded)
+      .then(response => response.text())
+      .then(rows => {
+        document.getElementById('contents').insertAdjacentHTML('beforeend', rows);
+        loaded += %(page_size)d;
+        busy = false;
+      });
+  });
+</script>
+"""
+
+YTCFG_SCRIPT = '<script>ytcfg.set({"INNERTUBE_API_KEY": "bench-key", "INNERTUBE_CLIENT_VERSION": "2.20240101.00.00"});</script>'
+
+
+def playlist_id(case):
+    return f"PLbench{case}"
+
+
+def video(case, index):
+    """Deterministic fields of the ``index``-th video; every 10th one is a short that gets filtered."""
+    return {
+        "id": f"{case[:2]}{index:09d}",
+        "title": f"{case.title()} lesson {index + 1}",
+        "duration": "0:45" if index % 10 == 9 else f"{(index * 7) % 59 + 1}:{index % 60:02d}",
+        "views": f"{(index * 37) % 999 + 1}K views",
+        "upload_time": f"{index % 11 + 1} years ago",
+    }
+
+
+def initial_data_script(data):
+    return f"<script>var ytInitialData = {json.dumps(data)};</script>"
+
+
+def row_html(case, index):
+    v = video(case, index)
+    title = html.escape(v["title"])
+    return (
+        "<ytd-playlist-video-renderer>"
+        f'<ytd-thumbnail><img src="/vi/{v["id"]}/hqdefault.jpg">'
+        f'<ytd-thumbnail-overlay-time-status-renderer><div class="badge-shape-wiz__text">{v["duration"]}</div>'
+        "</ytd-thumbnail-overlay-time-status-renderer></ytd-thumbnail>"
+        f'<a id="video-title" href="/watch?v={v["id"]}&amp;list={playlist_id(case)}&amp;index={index + 1}" title="{title}">{title}</a>'
+        f'<div id="channel-name"><div id="text">{CHANNEL}</div></div>'
+        f'<div id="metadata-line"><yt-formatted-string>{v["views"]}</yt-formatted-string>'
+        f'<yt-formatted-string>{v["upload_time"]}</yt-formatted-string></div>'
+        "</ytd-playlist-video-renderer>"
+    )
+
+
+def video_renderer(case, index):
+    v = video(case, index)
+    return {"playlistVideoRenderer": {
+        "videoId": v["id"],
+        "title": {"runs": [{"text": v["title"]}]},
+        "navigationEndpoint": {"commandMetadata": {"webCommandMetadata": {
+            "url": f"/watch?v={v['id']}&list={playlist_id(case)}&index={index + 1}"}}},
+        "shortBylineText": {"runs": [{"text": CHANNEL}]},
+        "thumbnail": {"thumbnails": [{"url": f"https://i.ytimg.com/vi/{v['id']}/hqdefault.jpg", "width": 168}]},
+        "lengthText": {"simpleText": v["duration"]},
+        "videoInfo": {"runs": [{"text": v["views"]}, {"text": " • "}, {"text": v["upload_time"]}]},
+    }}
+
+
+def page_items(case, start):
+    """InnerTube items for one page of the playlist, ending in a continuation if more remain."""
+    total = CASES[case]
+    items = [video_renderer(case, i) for i in range(start, min(start + PAGE_SIZE, total))]
+    if start + PAGE_SIZE < total:
+        items.append({"continuationItemRenderer": {"continuationEndpoint": {
+            "continuationCommand": {"token": f"{case}:{start + PAGE_SIZE}"}}}})
+    return items
+
+
+def search_html(case):
+    title = f"{case.title()} course ({CASES[case]} videos)"
+    href = f"/playlist?list={playlist_id(case)}"
+    data = {"contents": {"twoColumnSearchResultsRenderer": {"primaryContents": {"sectionListRenderer": {"contents": [
+        {"itemSectionRenderer": {"contents": [{"lockupViewModel": {
+            "contentId": playlist_id(case),
+            "contentType": "LOCKUP_CONTENT_TYPE_PLAYLIST",
+            "metadata": {"lockupMetadataViewModel": {"title": {"content": title}}},
+            "rendererContext": {"commandContext": {"onTap": {"innertubeCommand": {
+                "commandMetadata": {"webCommandMetadata": {"url": href}}}}}},
+        }}]}}
+    ]}}}}}
+    return (
+        f"<!doctype html><html><head>{STYLE}</head><body>"
+        '<ytd-item-section-renderer><div id="contents"><ytd-lockup-view-model><h3>'
+        f'<a class="yt-lockup-metadata-view-model-wiz__title" href="{href}" title="{html.escape(title)}">{html.escape(title)}</a>'
+        "</h3></ytd-lockup-view-model></div></ytd-item-section-renderer>"
+        f"{initial_data_script(data)}{YTCFG_SCRIPT}</body></html>"
+    )
+
+
+def playlist_html(case):
+    total = CASES[case]
+    title = f"{case.title()} course ({total} videos)"
+    data = {
+        "header": {"playlistHeaderRenderer": {
+            "title": {"simpleText": title},
+            "ownerText": {"runs": [{"text": CHANNEL}]},
+            "numVideosText": {"runs": [{"text": str(total)}, {"text": " videos"}]},
+        }},
+        "contents": {"twoColumnBrowseResultsRenderer": {"tabs": [{"tabRenderer": {"content": {"sectionListRenderer": {
+            "contents": [{"itemSectionRenderer": {"contents": [{"playlistVideoListRenderer": {
+                "contents": page_items(case, 0)}}]}}]}}}}]}},
+    }
+    rows = "".join(row_html(case, i) for i in range(min(PAGE_SIZE, total)))
+    return (
+        f"<!doctype html><html><head>{STYLE}</head><body>"
+        f"<ytd-playlist-header-renderer><h1>{html.escape(title)}</h1>"
+        f'<ytd-channel-name><yt-formatted-string><a href="/@bench">{CHANNEL}</a></yt-formatted-string></ytd-channel-name>'
+        '<div class="metadata-stats"><ytd-playlist-byline-renderer>'
+        f'<yt-formatted-string class="byline-item">{total} videos</yt-formatted-string>'
+        "</ytd-playlist-byline-renderer></div></ytd-playlist-header-renderer>"
+        f'<div id="contents">{rows}</div>'
+        + SCROLL_SCRIPT % {"loaded": min(PAGE_SIZE, total), "total": total,
+                           "playlist_id": playlist_id(case), "page_size": PAGE_SIZE}
+        + f"{initial_data_script(data)}{YTCFG_SCRIPT}</body></html>"
+    )
+
+
+def continuation_json(case, start):
+    return json.dumps({"onResponseReceivedActions": [
+        {"appendContinuationItemsAction": {"continuationItems": page_items(case, start)}}]})
+
+
+def write_fixtures(out_dir, cases=None):
+    """Generate the fixture tree for ``cases`` (all by default) under ``out_dir``."""
+    cases = cases or list(CASES)
+    for case in cases:
+        case_dir = os.path.join(out_dir, case)
+        os.makedirs(case_dir, exist_ok=True)
+        with open(os.path.join(case_dir, "search.html"), "w", encoding="utf-8") as f:
+            f.write(search_html(case))
+        with open(os.path.join(case_dir, "playlist.html"), "w", encoding="utf-8") as f:
+            f.write(playlist_html(case))
+        for start in range(PAGE_SIZE, CASES[case], PAGE_SIZE):
+            with open(os.path.join(case_dir, f"rows_{start}.html"), "w", encoding="utf-8") as f:
+                f.write("".join(row_html(case, i) for i in range(start, min(start + PAGE_SIZE, CASES[case]))))
+            with open(os.path.join(case_dir, f"continuation_{start}.json"), "w", encoding="utf-8") as f:
+                f.write(continuation_json(case, start))
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({case: {"playlist_id": playlist_id(case), "videos": CASES[case]} for case in cases}, f, indent=2)
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate offline YouTube fixture pages for benchmarks')
+    parser.add_argument('--out', type=str, default=os.path.join('benchmarks', 'data'), help='Output directory')
+    parser.add_argument('--cases', nargs='*', choices=list(CASES), help='Cases to generate (default: all)')
+    args = parser.parse_args()
+    print(f"Fixtures written to: {write_fixtures(args.out, args.cases)}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
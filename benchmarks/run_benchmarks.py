@@ -0,0 +1,186 @@
+"""Offline benchmark suite: replays fixture pages through every engine and records performance.
+
+Each (case, engine, mode) combination runs in a fresh process against a
+local fixture server, so peak memory and browser state don't leak between
+runs. Results can be saved as a baseline and later runs compared against
+it; the exit status is 1 when any scenario regressed beyond the tolerance.
+
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from benchmarks.fixtures import CASES
+from benchmarks.fixture_server import start_fixture_server
+
+log = logging.getLogger(__name__)
+
+# engine -> modes it is benchmarked in
+SCENARIOS = {"http": ["default"], "browser": ["default", "block_resources"]}
+# Metrics compared against the baseline, and whether higher is better
+COMPARED_METRICS = {"wall_s": False, "records_per_s": True, "playwright_calls": False, "peak_rss_mb": False}
+
+
+def scenario_name(case, engine, mode):
+    return f"{case}/{engine}/{mode}"
+
+
+def run_once(case, engine, mode, base_url):
+    """Scrape one fixture case in this process and return its measurements."""
+    logging.getLogger().setLevel(logging.WARNING)
+    os.environ["YOUTUBE_BASE_URL"] = base_url
+    from metrics import ScrapeMetrics, peak_rss_bytes
+    from selector_resolver import SelectorResolver
+
+    metrics = ScrapeMetrics()
+    start = time.perf_counter()
+    if engine == "http":
+        from http_engine import scrape_playlist_http
+        video_data = scrape_playlist_http(f"{case} course", base_url=base_url, metrics=metrics)
+    else:
+        from Youtube_scraperV3 import scrape_youtube_browser
+        # A throwaway resolver keeps runs independent of saved selector stats
+        video_data = scrape_youtube_browser(f"{case} course", block_resources=mode == "block_resources",
+                                            resolver=SelectorResolver(path=None), metrics=metrics)
+    wall = time.perf_counter() - start
+
+    import resource
+    report = metrics.report()
+    # The browser and its driver have exited by now, so they are the only finished children
+    child_rss = peak_rss_bytes(resource.RUSAGE_CHILDREN) if engine == "browser" else None
+    return {
+        "wall_s": wall,
+        "videos": len(video_data["videos"]),
+        "records_per_s": len(video_data["videos"]) / wall if wall else None,
+        "playwright_calls": report["counters"].get("playwright_calls", 0),
+        "http_requests": report["counters"].get("http_requests", 0),
+        "peak_rss_mb": peak_rss_bytes() / 2**20,
+        "browser_peak_rss_mb": child_rss / 2**20 if child_rss else None,
+        "phases_ms": report["phases_ms"],
+    }
+
+
+def run_scenario(case, engine, mode, base_url, repeat):
+    """Run a scenario ``repeat`` times, each in a fresh process, and keep the median of each measurement."""
+    runs = []
+    context = multiprocessing.get_context("spawn")
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            runs.append(executor.submit(run_once, case, engine, mode, base_url).result())
+    result = {"runs": len(runs)}
+    for key in ("wall_s", "records_per_s", "peak_rss_mb", "browser_peak_rss_mb"):
+        values = [run[key] for run in runs if run[key] is not None]
+        result[key] = round(statistics.median(values), 3) if values else None
+    # Counts are deterministic for a given fixture
+    for key in ("videos", "playwright_calls", "http_requests", "phases_ms"):
+        result[key] = runs[-1][key]
+    return result
+
+
+def run_suite(cases, engines, repeat=3, fixtures_dir=None):
+    server, base_url = start_fixture_server(fixtures_dir)
+    results = {}
+    try:
+        for case in cases:
+            for engine in engines:
+                for mode in SCENARIOS[engine]:
+                    name = scenario_name(case, engine, mode)
+                    print(f"Running {name} ...", flush=True)
+                    try:
+                        results[name] = run_scenario(case, engine, mode, base_url, repeat)
+                    except Exception as e:
+                        # Most likely no browser binary; keep the rest of the suite going
+                        log.warning(f"{name} failed: {e}")
+                        results[name] = {"error": str(e).splitlines()[0] if str(e) else type(e).__name__}
+    finally:
+        server.shutdown()
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Return ``(rows, regressions)`` comparing each shared scenario's metrics with the baseline."""
+    rows, regressions = [], []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old or "error" in result or "error" in old:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            new_value, old_value = result.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            regressed = change < -tolerance if higher_is_better else change > tolerance
+            rows.append((name, metric, old_value, new_value, change, regressed))
+            if regressed:
+                regressions.append(f"{name} {metric}")
+    return rows, regressions
+
+
+def format_cell(value, width, precision=1):
+    return f"{value:>{width}.{precision}f}" if value is not None else f"{'-':>{width}}"
+
+
+def print_results(suite):
+    print(f"\n{'scenario':<30}{'videos':>8}{'wall s':>10}{'rec/s':>10}{'pw calls':>10}{'http req':>10}{'rss MB':>10}{'browser MB':>12}")
+    for name, r in suite["results"].items():
+        if "error" in r:
+            print(f"{name:<30}  skipped: {r['error']}")
+            continue
+        print(f"{name:<30}{r['videos']:>8}{format_cell(r['wall_s'], 10, 3)}{format_cell(r['records_per_s'], 10, 0)}"
+              f"{r['playwright_calls']:>10}{r['http_requests']:>10}{format_cell(r['peak_rss_mb'], 10)}"
+              f"{format_cell(r['browser_peak_rss_mb'], 12)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the offline scraper benchmarks')
+    parser.add_argument('--cases', nargs='*', choices=list(CASES), default=list(CASES), help='Fixture cases to run')
+    parser.add_argument('--engines', nargs='*', choices=list(SCENARIOS), default=list(SCENARIOS), help='Engines to run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario (the median is reported)')
+    parser.add_argument('--fixtures-dir', type=str, help='Replay these fixtures instead of generated ones')
+    parser.add_argument('--output', type=str, help='Write the results as JSON to this file')
+    parser.add_argument('--save-baseline', type=str, metavar='PATH', help='Save the results as a baseline')
+    parser.add_argument('--compare', type=str, metavar='PATH', help='Compare the results with a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative slowdown before a metric counts as a regression')
+    args = parser.parse_args()
+
+    suite = run_suite(args.cases, args.engines, args.repeat, args.fixtures_dir)
+    print_results(suite)
+    for path in filter(None, (args.output, args.save_baseline)):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(suite, f, indent=2)
+        print(f"\nResults saved to: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows, regressions = compare(suite, baseline, args.tolerance)
+        print(f"\nCompared with {args.compare} (tolerance {args.tolerance:.0%}):")
+        for name, metric, old_value, new_value, change, regressed in rows:
+            print(f"  {name:<30}{metric:<18}{old_value:>10.3f} -> {new_value:>10.3f} ({change:+.1%}){'  REGRESSION' if regressed else ''}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,284 @@
+import atexit
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_USES = 50
+HEALTH_CHECK_INTERVAL = 30  # seconds between health checks of an idle browser
+LIVENESS_POLL = 5  # seconds a streaming caller waits for an event before checking the workers are alive
+
+_STOP = object()
+_DONE = object()
+
+
+class BrowserServiceError(Exception):
+    """Raised when the service is closed or its browser can't be launched."""
+
+
+class BrowserService:
+    """Warm Chromium instances that run each scrape in a fresh isolated context.
+
+    Playwright's sync API is bound to the thread that started it, so every
+    browser is owned by a worker thread and scrapes are handed to the
+    workers over a queue; any thread may submit. A browser is relaunched
+    when it has crashed (checked before each job and periodically while
+    idle) and recycled after ``max_uses`` jobs to bound its memory growth.
+    The browsers are closed by ``close()``, which also runs at exit. If
+    every worker has stopped (closed, or Playwright itself failed), queued
+    and new jobs fail with ``BrowserServiceError`` instead of waiting.
+    """
+
+    def __init__(self, size=1, max_uses=DEFAULT_MAX_USES, headless=True, health_interval=HEALTH_CHECK_INTERVAL):
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.health_interval = health_interval
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._status = {}
+        self._closed = False
+        self._live_workers = size
+        self._threads = [threading.Thread(target=self._run_worker, name=f"browser-service-{i}", daemon=True)
+                         for i in range(size)]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.close)
+
+    def _launch(self, playwright, browser, status):
+        """Return a healthy browser, relaunching ``browser`` if it crashed or is used up."""
+        if browser is not None:
+            if not browser.is_connected():
+                log.warning("Browser disconnected; relaunching")
+            elif status["uses"] >= self.max_uses:
+                log.info(f"Browser served {status['uses']} scrapes; recycling it")
+                try:
+                    browser.close()
+                except Exception as e:
+                    log.debug(f"Ignoring error while closing browser: {e}")
+            else:
+                return browser
+            status["restarts"] += 1
+        start = time.monotonic()
+        browser = playwright.chromium.launch(headless=self.headless)
+        status.update(alive=True, uses=0, launched_at=time.time(), last_error=None)
+        log.debug(f"Launched browser in {(time.monotonic() - start) * 1000:.0f}ms")
+        return browser
+
+    def _run_worker(self):
+        name = threading.current_thread().name
+        status = {"alive": False, "uses": 0, "restarts": 0, "launched_at": None, "last_error": None}
+        with self._lock:
+            self._status[name] = status
+        try:
+            self._serve(status)
+        except BaseException as e:
+            status["last_error"] = str(e)
+            log.error(f"Browser worker {name} stopped: {e}")
+        finally:
+            status["alive"] = False
+            with self._lock:
+                self._live_workers -= 1
+                last = self._live_workers == 0
+            if last:
+                self._fail_pending(status["last_error"])
+
+    def _fail_pending(self, last_error):
+        """Fail the jobs left in the queue once no worker is left to run them."""
+        reason = "Browser service is closed" if self._closed else f"No browser worker is running ({last_error})"
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is not _STOP and job[1].set_running_or_notify_cancel():
+                job[1].set_exception(BrowserServiceError(reason))
+
+    def _serve(self, status):
+        # Imported here so the module can be imported where Playwright isn't installed
+        from playwright.sync_api import sync_playwright
+
+        browser = None
+        with sync_playwright() as playwright:
+            job = None
+            while job is not _STOP:
+                try:
+                    browser = self._launch(playwright, browser, status)
+                except Exception as e:
+                    browser = None
+                    status.update(alive=False, last_error=str(e))
+                    log.error(f"Could not launch browser: {e}")
+                try:
+                    job = self._jobs.get(timeout=self.health_interval)
+                except queue.Empty:
+                    continue
+                if job is _STOP or not job[1].set_running_or_notify_cancel():
+                    continue
+                fn, future = job
+                if browser is None or not browser.is_connected():
+                    # Relaunch once more rather than failing the job on a stale crash
+                    try:
+                        browser = self._launch(playwright, browser, status)
+                    except Exception as e:
+                        future.set_exception(BrowserServiceError(f"Could not launch browser: {e}"))
+                        continue
+                status["uses"] += 1
+                try:
+                    future.set_result(fn(browser))
+                except BaseException as e:
+                    future.set_exception(e)
+                status["alive"] = browser.is_connected()
+            if browser is not None and browser.is_connected():
+                browser.close()
+
+    def alive(self):
+        """Whether any worker thread is still taking jobs."""
+        with self._lock:
+            return self._live_workers > 0
+
+    def submit(self, fn):
+        """Run ``fn(browser)`` on a worker thread and return a ``Future`` for its result."""
+        future = Future()
+        # Under the lock so a job can't slip in after the last worker drained the queue
+        with self._lock:
+            if self._closed:
+                raise BrowserServiceError("Browser service is closed")
+            if self._live_workers == 0:
+                raise BrowserServiceError("No browser worker is running")
+            self._jobs.put((fn, future))
+        return future
+
+    def iter_scrape(self, course_name, **kwargs):
+        """Stream ``iter_scrape_youtube_browser`` events from a warm browser to the calling thread."""
+        from Youtube_scraperV3 import iter_scrape_youtube_browser
+
+        events = queue.Queue()
+
+        def scrape(browser):
+            for event in iter_scrape_youtube_browser(course_name, browser=browser, **kwargs):
+                events.put(event)
+
+        future = self.submit(scrape)
+        future.add_done_callback(lambda f: events.put(_DONE))
+        while True:
+            try:
+                event = events.get(timeout=LIVENESS_POLL)
+            except queue.Empty:
+                if not future.done() and not self.alive():
+                    raise BrowserServiceError("Browser service stopped before the scrape finished")
+                continue
+            if event is _DONE:
+                break
+            yield event
+        future.result()
+
+    def scrape(self, course_name, **kwargs):
+        from Youtube_scraperV3 import collect_video_data
+        return collect_video_data(self.iter_scrape(course_name, **kwargs))
+
+    def health(self):
+        """Per-browser liveness, uses and restarts, plus the number of queued jobs."""
+        with self._lock:
+            browsers = {name: dict(status) for name, status in self._status.items()}
+        return {
+            "healthy": self.alive() and any(status["alive"] for status in browsers.values()),
+            "queued": self._jobs.qsize(),
+            "browsers": browsers,
+        }
+
+    def close(self, timeout=30):
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        atexit.unregister(self.close)
+
+
+class ScrapeRequestHandler(BaseHTTPRequestHandler):
+    """``GET /scrape?course=...`` returns the result as JSON (``&stream=1`` for NDJSON events); ``GET /health``."""
+
+    service = None
+    cache = None
+    block_resources = False
+
+    def log_message(self, format, *args):
+        log.info(f"{self.address_string()} {format % args}")
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parts.query)
+        if parts.path == "/health":
+            health = self.service.health()
+            self.send_json(200 if health["healthy"] else 503, health)
+            return
+        if parts.path != "/scrape":
+            self.send_json(404, {"error": "not found"})
+            return
+        course_name = query.get("course", [""])[0].strip()
+        if not course_name:
+            self.send_json(400, {"error": "missing course parameter"})
+            return
+        try:
+            if query.get("stream", ["0"])[0] == "1":
+                self.stream(course_name)
+            else:
+                self.send_json(200, self.scrape(course_name, refresh=query.get("refresh", ["0"])[0] == "1"))
+        except Exception as e:
+            log.error(f"Scrape of '{course_name}' failed: {e}")
+            self.send_json(502, {"error": str(e)})
+
+    def scrape(self, course_name, refresh=False):
+        scrape = lambda: self.service.scrape(course_name, block_resources=self.block_resources)
+        if self.cache is None:
+            return scrape()
+        from result_cache import get_or_scrape
+        from Youtube_scraperV3 import get_playlist_search_url
+        return get_or_scrape(self.cache, course_name, get_playlist_search_url, scrape, refresh)[0]
+
+    def stream(self, course_name):
+        events = self.service.iter_scrape(course_name, block_resources=self.block_resources)
+        # Pull the first event before committing to a 200 so early failures get an error status
+        first = next(events)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+        try:
+            for kind, payload in itertools.chain([first], events):
+                self.write_line(kind, payload)
+        except ConnectionError:
+            log.debug(f"Client went away while streaming '{course_name}'")
+        except Exception as e:
+            # Headers are gone already, so report the failure in-band
+            log.error(f"Scrape of '{course_name}' failed mid-stream: {e}")
+            self.write_line("error", str(e))
+
+    def write_line(self, kind, payload):
+        self.wfile.write((json.dumps({"type": kind, "data": payload}, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+def make_server(service, host="127.0.0.1", port=8080, cache=None, block_resources=False):
+    """Build a threaded HTTP server answering scrape requests from ``service``'s warm browsers."""
+    handler = type("Handler", (ScrapeRequestHandler,),
+                   {"service": service, "cache": cache, "block_resources": block_resources})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,237 @@
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from http_engine import HttpEngineError, extract_embedded_json, fetch_html, find_renderers, get_session, get_text
+from incremental import playlist_key
+from Youtube_scraperV3 import origin_of, parse_duration, video_id_from_url
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_CHECKPOINT_DIR = os.path.join(".cache", "enrichment")
+# Checkpointed details older than this are fetched again; view and like counts go stale
+DEFAULT_CHECKPOINT_MAX_AGE = 24 * 3600  # seconds
+# Statuses worth retrying; anything else (404, a removed or private video) fails at once
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+
+# "like this video along with 12,345 other people"
+LIKES_PATTERN = re.compile(r'along with ([\d,.]+) other (?:people|person)', re.IGNORECASE)
+# Description lines such as "12:34 Recursion" or "1:02:03 - Wrap up"
+TIMESTAMP_LINE = re.compile(r'^\s*\(?((?:\d+:)?\d{1,2}:\d{2})\)?\s*[-–—:|]?\s*(.+?)\s*$')
+
+
+def default_checkpoint_path(playlist_url):
+    return os.path.join(DEFAULT_CHECKPOINT_DIR, f"{playlist_key(playlist_url)}.jsonl")
+
+
+def iter_strings(obj):
+    """Yield every string value below ``obj``."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from iter_strings(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from iter_strings(item)
+
+
+def parse_like_count(data):
+    for _, renderer in find_renderers(data, {"likeButtonViewModel", "segmentedLikeDislikeButtonViewModel"}):
+        for text in iter_strings(renderer):
+            match = LIKES_PATTERN.search(text)
+            if match:
+                return int(re.sub(r'[,.]', '', match.group(1)))
+    return None
+
+
+def parse_description_chapters(description):
+    """Chapters listed as timestamps in the description; YouTube needs at least three starting at 0:00."""
+    chapters = []
+    for line in (description or "").splitlines():
+        match = TIMESTAMP_LINE.match(line)
+        if match:
+            chapters.append({"title": match.group(2), "start_seconds": parse_duration(match.group(1))})
+    if len(chapters) < 3 or chapters[0]["start_seconds"] != 0:
+        return []
+    return chapters
+
+
+def parse_chapters(data, description):
+    """Chapters from the player's chapter markers, falling back to description timestamps."""
+    chapters = {}
+    for name, renderer in find_renderers(data, {"chapterRenderer", "macroMarkersListItemRenderer"}):
+        title = get_text(renderer.get("title"))
+        if name == "chapterRenderer":
+            start = renderer.get("timeRangeStartMillis", 0) / 1000
+        else:
+            start = parse_duration(get_text(renderer.get("timeDescription")) or "")
+        if title and start not in chapters:
+            chapters[start] = {"title": title, "start_seconds": int(start)}
+    if chapters:
+        return sorted(chapters.values(), key=lambda c: c["start_seconds"])
+    return parse_description_chapters(description)
+
+
+def parse_watch_page(html):
+    """Return the enrichment fields embedded in a watch page's player response and initial data."""
+    player = extract_embedded_json(html, "ytInitialPlayerResponse")
+    try:
+        data = extract_embedded_json(html, "ytInitialData")
+    except HttpEngineError:
+        data = {}
+    details = player.get("videoDetails") or {}
+    if not details:
+        status = (player.get("playabilityStatus") or {}).get("status")
+        raise HttpEngineError(f"No video details in player response (status: {status})")
+    microformat = (player.get("microformat") or {}).get("playerMicroformatRenderer") or {}
+    description = details.get("shortDescription", "")
+    view_count = details.get("viewCount")
+    return {
+        "description": description,
+        "chapters": parse_chapters(data, description),
+        "publish_date": microformat.get("publishDate") or microformat.get("uploadDate"),
+        "like_count": parse_like_count(data),
+        "view_count": int(view_count) if view_count and str(view_count).isdigit() else None,
+    }
+
+
+class EnrichmentCheckpoint:
+    """JSONL of finished videos, so an interrupted enrichment resumes where it stopped.
+
+    Entries older than ``max_age`` seconds are dropped when the file is
+    opened, so a later run refetches them instead of reusing stale counts;
+    the file is rewritten with the entries that are kept.
+    """
+
+    def __init__(self, path, max_age=DEFAULT_CHECKPOINT_MAX_AGE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done = {}
+        kept = {}
+        if os.path.exists(path):
+            cutoff = time.time() - max_age
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by the interruption
+                    if "details" in entry and entry.get("fetched_at", 0) >= cutoff:
+                        kept[entry["video_id"]] = entry
+                        self.done[entry["video_id"]] = entry["details"]
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+        for entry in kept.values():
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def record(self, video_id, details):
+        entry = {"video_id": video_id, "details": details, "fetched_at": time.time()}
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def is_transient(error):
+    """Whether a failed fetch may succeed on retry: timeouts, dropped connections, 429 and 5xx."""
+    cause = error.__cause__
+    if isinstance(cause, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(cause, requests.HTTPError) and cause.response is not None:
+        return cause.response.status_code in TRANSIENT_STATUSES
+    return False
+
+
+def fetch_details(watch_url, session, retries, timeout, backoff):
+    """Fetch and parse one watch page, retrying transient failures with exponential backoff.
+
+    Returns ``(details, attempts)``; a raised ``HttpEngineError`` carries
+    the number of requests made as ``attempts``.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return parse_watch_page(fetch_html(watch_url, session, timeout)), attempt + 1
+        except HttpEngineError as e:
+            if attempt == retries or not is_transient(e):
+                e.attempts = attempt + 1
+                raise
+            delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+            log.debug(f"Enriching {watch_url} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def enrich_videos(videos, checkpoint_path=None, concurrency=DEFAULT_CONCURRENCY, retries=2, timeout=15, backoff=1.0,
+                  session=None, metrics=None, checkpoint_max_age=DEFAULT_CHECKPOINT_MAX_AGE):
+    """Add description, chapters, publish date, like and view counts to each video record in place.
+
+    Watch pages are fetched over HTTP by up to ``concurrency`` threads and
+    parsed from their embedded player response and initial data; timeouts,
+    429s and 5xx get ``retries`` retries of ``timeout`` seconds, other
+    failures none. With a ``checkpoint_path``, finished videos are
+    appended to it as they complete and reused by runs within
+    ``checkpoint_max_age`` seconds. Videos that still fail get an
+    ``enrichment_error``. Returns counts for the output metadata.
+    """
+    session = session or get_session()
+    checkpoint = EnrichmentCheckpoint(checkpoint_path, checkpoint_max_age) if checkpoint_path else None
+    start = time.monotonic()
+    stats = {"enriched": 0, "from_checkpoint": 0, "failed": 0}
+
+    todo = []
+    for video in videos:
+        video_id = video_id_from_url(video.get("url"))
+        if checkpoint and video_id in checkpoint.done:
+            video.update(checkpoint.done[video_id])
+            stats["from_checkpoint"] += 1
+        elif video_id:
+            todo.append((video, video_id))
+    log.debug(f"Enriching {len(todo)} videos ({stats['from_checkpoint']} from checkpoint)")
+
+    # Pending fetches are cancelled on an interrupt; finished ones are already checkpointed
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        futures = {
+            executor.submit(fetch_details, f"{origin_of(video['url'])}/watch?v={video_id}", session, retries, timeout,
+                            backoff): (video, video_id)
+            for video, video_id in todo
+        }
+        for future in as_completed(futures):
+            video, video_id = futures[future]
+            try:
+                details, attempts = future.result()
+            except HttpEngineError as e:
+                log.warning(f"Could not enrich {video_id}: {e}")
+                video["enrichment_error"] = str(e)
+                stats["failed"] += 1
+                if metrics:
+                    metrics.count("http_requests", getattr(e, "attempts", retries + 1))
+                continue
+            video.update(details)
+            video.pop("enrichment_error", None)
+            stats["enriched"] += 1
+            if metrics:
+                metrics.count("http_requests", attempts)
+            if checkpoint:
+                checkpoint.record(video_id, details)
+    finally:
+        executor.shutdown(cancel_futures=True)
+        if checkpoint:
+            checkpoint.close()
+
+    stats["elapsed_seconds"] = round(time.monotonic() - start, 2)
+    if checkpoint_path:
+        stats["checkpoint"] = checkpoint_path
+    return stats
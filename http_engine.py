@@ -0,0 +1,333 @@
+import logging
+import json
+import re
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import ScrapeMetrics
+from Youtube_scraperV3 import (
+    get_base_url, get_playlist_search_url, build_video_records, new_video_data, video_id_from_url,
+    collect_video_data,
+)
+
+log = logging.getLogger(__name__)
+
+# Fallback InnerTube client version used when the page config can't be read
+DEFAULT_CLIENT_VERSION = "2.20240101.00.00"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_session = None
+
+
+class HttpEngineError(Exception):
+    """Raised when the browserless engine can't fetch or parse a page."""
+
+
+def get_session():
+    """Return the shared pooled HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+        _session.headers.update(HEADERS)
+        # Skip the EU cookie consent interstitial
+        _session.cookies.set("CONSENT", "YES+1")
+    return _session
+
+
+def extract_embedded_json(html, name):
+    """Pull the JSON object a YouTube page assigns to ``name`` (e.g. ytInitialData) out of its HTML."""
+    match = re.search(rf'(?:var {name}|window\["{name}"\])\s*=\s*', html)
+    if not match:
+        raise HttpEngineError(f"{name} not found in page")
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError as e:
+        raise HttpEngineError(f"Failed to decode {name}: {e}")
+    return data
+
+
+def extract_initial_data(html):
+    return extract_embedded_json(html, "ytInitialData")
+
+
+def extract_ytcfg(html):
+    """Read the InnerTube API key and client version from the page config."""
+    api_key = re.search(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"', html)
+    version = re.search(r'"INNERTUBE_CLIENT_VERSION"\s*:\s*"([^"]+)"', html)
+    return {
+        "api_key": api_key.group(1) if api_key else None,
+        "client_version": version.group(1) if version else DEFAULT_CLIENT_VERSION,
+    }
+
+
+def find_renderers(obj, names):
+    """Yield (name, value) for every dict key in ``names``, depth first in document order."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in names:
+                yield key, value
+            else:
+                yield from find_renderers(value, names)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from find_renderers(item, names)
+
+
+def get_text(node):
+    """Flatten a YouTube text node ({simpleText}, {runs} or {content}) to a string."""
+    if not node:
+        return None
+    if isinstance(node, str):
+        return node
+    if "simpleText" in node:
+        return node["simpleText"]
+    if "runs" in node:
+        return "".join(run.get("text", "") for run in node["runs"])
+    if "content" in node:
+        return node["content"]
+    return None
+
+
+def get_url(endpoint):
+    """Return the relative web URL of a navigation/innertube command."""
+    try:
+        return endpoint["commandMetadata"]["webCommandMetadata"]["url"]
+    except (KeyError, TypeError):
+        return None
+
+
+def parse_search_playlists(data):
+    """Return the playlist results of a search page as {title, href, channel, playlist_id} dicts."""
+    playlists = []
+    for name, renderer in find_renderers(data, {"playlistRenderer", "lockupViewModel"}):
+        if name == "playlistRenderer":
+            playlist_id = renderer.get("playlistId")
+            href = get_url(renderer.get("navigationEndpoint")) or f"/playlist?list={playlist_id}"
+            playlists.append({
+                "title": get_text(renderer.get("title")),
+                "href": href,
+                "channel": get_text(renderer.get("shortBylineText")),
+                "playlist_id": playlist_id,
+            })
+        elif renderer.get("contentType") == "LOCKUP_CONTENT_TYPE_PLAYLIST":
+            playlist_id = renderer.get("contentId")
+            metadata = renderer.get("metadata", {}).get("lockupMetadataViewModel", {})
+            try:
+                command = renderer["rendererContext"]["commandContext"]["onTap"]["innertubeCommand"]
+                href = get_url(command)
+            except KeyError:
+                href = None
+            channel = None
+            try:
+                rows = metadata["metadata"]["contentMetadataViewModel"]["metadataRows"]
+                channel = get_text(rows[0]["metadataParts"][0]["text"])
+            except (KeyError, IndexError):
+                pass
+            playlists.append({
+                "title": get_text(metadata.get("title")),
+                "href": href or f"/playlist?list={playlist_id}",
+                "channel": channel,
+                "playlist_id": playlist_id,
+            })
+    return [p for p in playlists if p["playlist_id"] and p["title"]]
+
+
+def parse_playlist_rows(data):
+    """Return (rows, continuation_token) from a playlist page or continuation response.
+
+    Rows use the same shape as ``PLAYLIST_ROWS_JS`` so they can go through
+    ``build_video_records`` unchanged.
+    """
+    rows = []
+    token = None
+    for name, renderer in find_renderers(data, {"playlistVideoRenderer", "continuationItemRenderer"}):
+        if name == "continuationItemRenderer":
+            try:
+                token = renderer["continuationEndpoint"]["continuationCommand"]["token"]
+            except KeyError:
+                pass
+            continue
+
+        duration = get_text(renderer.get("lengthText"))
+        if duration is None:
+            for overlay in renderer.get("thumbnailOverlays", []):
+                status = overlay.get("thumbnailOverlayTimeStatusRenderer")
+                if status:
+                    duration = get_text(status.get("text"))
+                    break
+        thumbnails = renderer.get("thumbnail", {}).get("thumbnails", [])
+        video_info = renderer.get("videoInfo", {}).get("runs", [])
+        rows.append({
+            "title": get_text(renderer.get("title")),
+            "href": get_url(renderer.get("navigationEndpoint")) or f"/watch?v={renderer.get('videoId')}",
+            "channel": get_text(renderer.get("shortBylineText")),
+            "thumbnail": thumbnails[0]["url"] if thumbnails else None,
+            "duration": duration.strip() if duration else None,
+            "metadata": [run["text"].strip() for run in video_info if run.get("text", "").strip() not in ("", "•")],
+        })
+    return rows, token
+
+
+def parse_playlist_owner(data):
+    """Return the playlist owner's name from a playlist page header, if present."""
+    for _, header in find_renderers(data, {"playlistHeaderRenderer"}):
+        owner = get_text(header.get("ownerText"))
+        if owner:
+            return owner
+    return None
+
+
+def iter_texts(obj):
+    """Yield every flattened text node below ``obj``."""
+    if isinstance(obj, dict):
+        text = get_text(obj) if ("runs" in obj or "simpleText" in obj or isinstance(obj.get("content"), str)) else None
+        if text:
+            yield text
+        else:
+            for value in obj.values():
+                yield from iter_texts(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from iter_texts(item)
+
+
+# Header fields holding the playlist's stats line; the title and description are never read
+HEADER_STATS_FIELDS = {"numVideosText", "stats", "byline", "metadata"}
+
+
+def parse_advertised_count(data):
+    """Return the "N videos" figure from a playlist page header's stats, if present."""
+    for _, node in find_renderers(data.get("header", {}), HEADER_STATS_FIELDS):
+        for text in iter_texts(node):
+            for item in re.split(r'[\u2022\n]', text):
+                match = re.fullmatch(r'\s*(\d[\d,.]*)\s+videos?\s*', item, re.IGNORECASE)
+                if match:
+                    return int(re.sub(r'[,.]', '', match.group(1)))
+    return None
+
+
+def fetch_html(url, session=None, timeout=15):
+    session = session or get_session()
+    try:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        raise HttpEngineError(f"Failed to fetch {url}: {e}") from e
+    return response.text
+
+
+def fetch_continuation(base_url, token, ytcfg, session=None):
+    session = session or get_session()
+    url = f"{base_url}/youtubei/v1/browse?prettyPrint=false"
+    if ytcfg["api_key"]:
+        url += f"&key={ytcfg['api_key']}"
+    payload = {
+        "context": {"client": {"clientName": "WEB", "clientVersion": ytcfg["client_version"], "hl": "en"}},
+        "continuation": token,
+    }
+    try:
+        response = session.post(url, json=payload, timeout=15)
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError) as e:
+        raise HttpEngineError(f"Failed to fetch playlist continuation: {e}")
+
+
+def iter_playlist_http(course_name, base_url=None, session=None, state_store=None, metrics=None):
+    """Scrape the first playlist for ``course_name`` without a browser, as a stream of events.
+
+    Fetches the search and playlist pages over a pooled HTTP session, reads
+    their embedded ``ytInitialData`` and follows continuation tokens until
+    every video is collected, or, with a ``state_store``, until the rows
+    known from the previous scrape are reached. Yields the same events as
+    ``iter_scrape_youtube_browser``, videos one continuation page at a time,
+    and raises ``HttpEngineError`` if any page can't be parsed.
+    """
+    session = session or get_session()
+    metrics = metrics or ScrapeMetrics()
+    base_url = base_url or get_base_url()
+    search_url = get_playlist_search_url(course_name, base_url)
+    video_data = new_video_data("http", search_url)
+
+    with metrics.phase("search_navigation"):
+        metrics.count("http_requests")
+        playlists = parse_search_playlists(extract_initial_data(fetch_html(search_url, session)))
+    if not playlists:
+        raise HttpEngineError("Could not find any playlist items")
+    first_playlist = playlists[0]
+    log.debug(f"Found playlist: {first_playlist['title']}")
+
+    playlist_url = f"{base_url}/playlist?list={urllib.parse.quote(first_playlist['playlist_id'])}"
+    with metrics.phase("playlist_navigation"):
+        metrics.count("http_requests")
+        html = fetch_html(playlist_url, session)
+        data = extract_initial_data(html)
+        ytcfg = extract_ytcfg(html)
+    with metrics.phase("row_extraction"):
+        rows, token = parse_playlist_rows(data)
+    if not rows:
+        raise HttpEngineError("Playlist page contained no videos")
+
+    channel = parse_playlist_owner(data) or first_playlist["channel"] or "Unknown Channel"
+    video_data["playlist_info"]["title"] = first_playlist["title"].strip()
+    video_data["playlist_info"]["channel"] = channel.strip()
+    video_data["playlist_info"]["url"] = f"{base_url}{first_playlist['href']}"
+    yield "playlist_info", video_data["playlist_info"]
+
+    expected_count = parse_advertised_count(data)
+    row_ids = []
+    state = None
+    stop_when = None
+    if state_store:
+        from incremental import make_stop_check
+        state = state_store.load(video_data["playlist_info"]["url"])
+        stop_when = make_stop_check(state, expected_count, lambda: row_ids)
+
+    videos = []
+    seen_tokens = set()
+    while True:
+        row_ids.extend(video_id_from_url(row.get("href")) for row in rows)
+        with metrics.phase("row_extraction"):
+            batch = build_video_records(rows, video_data["playlist_info"]["channel"], base_url)
+        metrics.count("rows_seen", len(rows))
+        metrics.count("rows_skipped", len(rows) - len(batch))
+        for video in batch:
+            if state_store:
+                videos.append(video)
+            yield "video", video
+        if not token or token in seen_tokens or (stop_when and stop_when(len(row_ids))):
+            break
+        seen_tokens.add(token)
+        log.debug(f"Fetching playlist continuation after {len(row_ids)} rows")
+        with metrics.phase("continuations"):
+            metrics.count("http_requests")
+            continuation = fetch_continuation(base_url, token, ytcfg, session)
+        with metrics.phase("row_extraction"):
+            rows, token = parse_playlist_rows(continuation)
+    log.debug(f"Found {len(row_ids)} videos in playlist")
+
+    if state_store:
+        from incremental import refresh_state
+        reused, delta, video_data["metadata"]["incremental"] = refresh_state(
+            state_store, video_data["playlist_info"]["url"], state, row_ids, videos, expected_count)
+        for video in reused:
+            yield "video", video
+        yield "delta", delta
+    if metrics.enabled:
+        video_data["metadata"]["metrics"] = metrics.report()
+    yield "metadata", video_data["metadata"]
+
+
+def scrape_playlist_http(course_name, base_url=None, session=None, state_store=None, metrics=None):
+    """Collect ``iter_playlist_http`` into the usual playlist_info/videos/metadata structure."""
+    return collect_video_data(iter_playlist_http(course_name, base_url, session, state_store, metrics))
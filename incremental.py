@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from Youtube_scraperV3 import video_id_from_url
+
+log = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = os.path.join(".cache", "playlists.sqlite3")
+
+# Fields that change between refreshes of an otherwise identical video
+MUTABLE_FIELDS = ("title", "duration", "views", "upload_time")
+
+# Consecutive known rows that must line up with the stored order before the
+# rest of the playlist is trusted to be unchanged
+ANCHOR_ROWS = 3
+
+
+def playlist_key(playlist_url):
+    """Identify a playlist by its list ID so watch and playlist URLs share state."""
+    query = urllib.parse.urlsplit(playlist_url).query
+    return urllib.parse.parse_qs(query).get("list", [playlist_url])[0]
+
+
+class PlaylistStateStore:
+    """Remembers, per playlist, the ordered row IDs and video records of the last scrape."""
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS playlists ("
+                "key TEXT PRIMARY KEY, row_ids TEXT, videos TEXT, updated_at REAL)"
+            )
+
+    def load(self, playlist_url):
+        """Return ``{"row_ids": [...], "videos": [...]}`` from the last scrape, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT row_ids, videos FROM playlists WHERE key = ?", (playlist_key(playlist_url),)
+            ).fetchone()
+        if not row:
+            return None
+        return {"row_ids": json.loads(row[0]), "videos": json.loads(row[1])}
+
+    def save(self, playlist_url, row_ids, videos):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO playlists VALUES (?, ?, ?, ?)",
+                (playlist_key(playlist_url), json.dumps(row_ids), json.dumps(videos, ensure_ascii=False), time.time()),
+            )
+
+    def close(self):
+        self._db.close()
+
+
+def find_resume_point(loaded_ids, known_ids, expected_count):
+    """Return the index in ``known_ids`` after which the unloaded rows are already known.
+
+    That holds when the last loaded rows match a run of the stored order and
+    the loaded rows plus the stored rows after that run add up to the
+    playlist's advertised count. Returns None when that can't be shown.
+    """
+    if not expected_count or len(loaded_ids) < ANCHOR_ROWS:
+        return None
+    tail = loaded_ids[-ANCHOR_ROWS:]
+    try:
+        position = known_ids.index(tail[-1])
+    except ValueError:
+        return None
+    if position < ANCHOR_ROWS - 1 or known_ids[position - ANCHOR_ROWS + 1:position + 1] != tail:
+        return None
+    if len(loaded_ids) + len(known_ids) - position - 1 != expected_count:
+        return None
+    return position
+
+
+def merge_with_state(state, row_ids, videos, expected_count):
+    """Merge freshly loaded rows with the stored snapshot.
+
+    ``row_ids`` are the IDs of every loaded row (including ones the duration
+    filter dropped) and ``videos`` the records built from them. Returns
+    ``(merged_row_ids, merged_videos, delta, reused)`` where ``delta`` lists
+    added, removed and changed videos and ``reused`` is the number of rows
+    taken from the stored snapshot without loading them. When fewer rows
+    than ``expected_count`` loaded and no resume point was found, the
+    known rows that weren't reached are kept and not reported as removed.
+    """
+    known_ids = state["row_ids"] if state else []
+    known_videos = {video_id_from_url(v["url"]): v for v in state["videos"]} if state else {}
+
+    position = find_resume_point(row_ids, known_ids, expected_count) if state else None
+    if position is not None:
+        remainder = known_ids[position + 1:]
+    elif state and expected_count and len(row_ids) < expected_count:
+        # The loader stopped short of the playlist; rows it never reached
+        # aren't gone, so keep them rather than reporting them removed
+        loaded = set(row_ids)
+        remainder = [vid for vid in known_ids if vid not in loaded]
+        log.warning(f"Loaded {len(row_ids)} of {expected_count} rows; keeping {len(remainder)} unloaded known rows")
+    else:
+        remainder = []
+    merged_row_ids = row_ids + remainder
+    merged_videos = videos + [known_videos[vid] for vid in remainder if vid in known_videos]
+
+    merged_ids = {video_id_from_url(v["url"]) for v in merged_videos}
+    delta = {"added": [], "removed": [], "changed": []}
+    for video in videos:
+        video_id = video_id_from_url(video["url"])
+        old = known_videos.get(video_id)
+        if old is None:
+            delta["added"].append(video)
+            continue
+        changes = {field: [old.get(field), video.get(field)] for field in MUTABLE_FIELDS
+                   if old.get(field) != video.get(field)}
+        if changes:
+            delta["changed"].append({"video_id": video_id, "title": video["title"], "changes": changes})
+    delta["removed"] = [v for vid, v in known_videos.items() if vid not in merged_ids]
+    return merged_row_ids, merged_videos, delta, len(remainder)
+
+
+def make_stop_check(state, expected_count, get_loaded_ids):
+    """Build a loader ``stop_when`` callback that fires once known territory is reached."""
+    if not state:
+        return None
+
+    def stop_when(count):
+        position = find_resume_point(get_loaded_ids(), state["row_ids"], expected_count)
+        if position is not None:
+            log.debug(f"Reached known playlist rows after {count} rows; reusing the stored rest")
+        return position is not None
+
+    return stop_when
+
+
+def refresh_state(store, playlist_url, state, row_ids, videos, expected_count):
+    """Merge a scrape into the stored snapshot and save it as the new state.
+    
+    Returns ``(reused_videos, delta, stats)``: the stored videos that complete
+    the snapshot without having been loaded, the added/removed/changed
+    delta and a summary for the output metadata.
+    """
+    merged_row_ids, merged_videos, delta, reused = merge_with_state(state, row_ids, videos, expected_count)
+    store.save(playlist_url, merged_row_ids, merged_videos)
+    stats = {
+        "first_run": state is None,
+        "rows_loaded": len(row_ids),
+        "rows_reused": reused,
+        "added": len(delta["added"]),
+        "removed": len(delta["removed"]),
+        "changed": len(delta["changed"]),
+    }
+    log.debug(f"Incremental refresh: {stats}")
+    return merged_videos[len(videos):], delta, stats
@@ -0,0 +1,167 @@
+import collections
+import logging
+import threading
+import time
+import uuid
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 8
+DEFAULT_KEEP_FINISHED = 200
+
+
+class QueueFullError(Exception):
+    """Raised by ``JobQueue.submit`` when too many jobs are already waiting."""
+
+
+class Job:
+    """One background scrape; updated by its worker as events arrive."""
+
+    def __init__(self, key, scrape, on_done=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.scrape = scrape
+        self.on_done = on_done
+        self.status = "queued"
+        self.playlist_info = None
+        self.videos = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+
+class JobQueue:
+    """Runs scrapes on a fixed pool of worker threads, collapsing identical queries.
+
+    ``submit`` returns a job ID at once and ``get`` reports progress. While
+    a job for a key is queued or running, submissions with the same key
+    join it instead of starting another scrape (single-flight). At most
+    ``max_pending`` jobs wait for a worker; beyond that ``submit`` raises
+    ``QueueFullError``, so a burst of users can't pile up browser work.
+    """
+
+    def __init__(self, workers=1, max_pending=DEFAULT_MAX_PENDING, keep_finished=DEFAULT_KEEP_FINISHED):
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self._cond = threading.Condition()
+        self._pending = collections.deque()
+        self._jobs = collections.OrderedDict()
+        self._inflight = {}
+        self._closed = False
+        self._threads = [threading.Thread(target=self._run_worker, name=f"scrape-job-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, key, scrape, on_done=None):
+        """Queue ``scrape()`` (an iterator of scrape events) under ``key`` and return the job ID.
+
+        ``on_done(result)`` runs on the worker once the scrape succeeded,
+        e.g. to cache the result. Joins the in-flight job for ``key`` if
+        there is one; raises ``QueueFullError`` when the queue is full.
+        """
+        with self._cond:
+            if self._closed:
+                raise QueueFullError("The job queue is shut down")
+            job = self._inflight.get(key)
+            if job is not None:
+                log.debug(f"Joining in-flight job {job.id} for '{key}'")
+                return job.id
+            if len(self._pending) >= self.max_pending:
+                raise QueueFullError(f"{len(self._pending)} scrapes are already waiting; try again shortly")
+            job = Job(key, scrape, on_done)
+            self._jobs[job.id] = job
+            self._inflight[key] = job
+            self._pending.append(job)
+            self._prune()
+            self._cond.notify()
+        log.debug(f"Queued job {job.id} for '{key}'")
+        return job.id
+
+    def get(self, job_id):
+        """Return a snapshot of the job as a dict, or None if it is unknown or was pruned."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {
+                "id": job.id,
+                "key": job.key,
+                "status": job.status,
+                "position": self._pending.index(job) + 1 if job.status == "queued" else 0,
+                "playlist_info": job.playlist_info,
+                "videos": list(job.videos),
+                "result": job.result,
+                "error": job.error,
+                "created_at": job.created_at,
+                "started_at": job.started_at,
+                "finished_at": job.finished_at,
+            }
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "running": sum(job.status == "running" for job in self._jobs.values()),
+                "jobs": len(self._jobs),
+            }
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.id]
+
+    def _run_worker(self):
+        from Youtube_scraperV3 import collect_video_data
+
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                job = self._pending.popleft()
+                job.status = "running"
+                job.started_at = time.time()
+
+            events = []
+            try:
+                for kind, payload in job.scrape():
+                    with self._cond:
+                        if kind == "playlist_info":
+                            job.playlist_info = payload
+                        elif kind == "video":
+                            job.videos.append(payload)
+                    events.append((kind, payload))
+                result, status, error = collect_video_data(events), "done", None
+            except Exception as e:
+                log.error(f"Job {job.id} for '{job.key}' failed: {e}")
+                result, status, error = None, "failed", str(e)
+
+            if result is not None and job.on_done:
+                try:
+                    job.on_done(result)
+                except Exception as e:
+                    log.warning(f"on_done callback of job {job.id} failed: {e}")
+
+            with self._cond:
+                job.result, job.status, job.error = result, status, error
+                job.finished_at = time.time()
+                job.scrape = job.on_done = None
+                if self._inflight.get(job.key) is job:
+                    del self._inflight[job.key]
+            log.debug(f"Job {job.id} for '{job.key}' {status} in {job.finished_at - job.started_at:.1f}s")
+
+    def close(self, timeout=None):
+        """Stop accepting jobs, let the workers finish what is queued and wait for them."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = logging.getLogger(__name__)
+
+# Playwright attributes that build lazy objects without talking to the browser;
+# their results are wrapped so calls on them are still counted
+LAZY_ATTRIBUTES = {"locator", "first", "last", "nth", "filter"}
+# Calls whose results need another round-trip (JSHandle.json_value)
+HANDLE_RETURNING = {"wait_for_function", "evaluate_handle"}
+
+
+def peak_rss_bytes(who=None):
+    """Peak resident set size of this process (or of its finished children), None if unavailable."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who is None else who)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+class ScrapeMetrics:
+    """Per-phase durations and counters for one scrape.
+
+    ``phase(name)`` times a block (repeated phases accumulate) and
+    ``count(name)`` bumps a counter. With ``enabled=False`` everything is a
+    no-op, so instrumented code needs no branches.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.phases = Counter()
+        self.counters = Counter()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def wrap(self, target):
+        """Return ``target`` (a Playwright page) proxied so each round-trip is counted."""
+        return CountingProxy(target, self) if self.enabled else target
+
+    def report(self):
+        # Only this process's peak: the browser is still running while a scrape
+        # reports, and RUSAGE_CHILDREN only covers children that have exited
+        # (the benchmark runner reads it once the browser is gone)
+        return {
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    def to_prometheus(self, labels=None):
+        """Render the report in the Prometheus text exposition format."""
+        report = self.report()
+        base = ",".join(f'{k}="{v}"' for k, v in (labels or {}).items())
+
+        def series(name, value, extra=""):
+            label_str = ",".join(part for part in (base, extra) if part)
+            return f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}"
+
+        lines = [
+            "# HELP yt_scraper_duration_seconds Wall time of the whole scrape.",
+            "# TYPE yt_scraper_duration_seconds gauge",
+            series("yt_scraper_duration_seconds", report["total_ms"] / 1000),
+            "# HELP yt_scraper_phase_seconds Wall time spent per scrape phase.",
+            "# TYPE yt_scraper_phase_seconds gauge",
+        ]
+        lines += [series("yt_scraper_phase_seconds", ms / 1000, f'phase="{name}"') for name, ms in report["phases_ms"].items()]
+        for name, value in report["counters"].items():
+            lines += [f"# TYPE yt_scraper_{name} gauge", series(f"yt_scraper_{name}", value)]
+        if report["peak_rss_bytes"] is not None:
+            lines += ["# TYPE yt_scraper_peak_rss_bytes gauge", series("yt_scraper_peak_rss_bytes", report["peak_rss_bytes"])]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, labels=None):
+        """Write the report to ``path``: Prometheus text for ``.prom``/``.txt``, JSON otherwise."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith((".prom", ".txt")):
+                f.write(self.to_prometheus(labels))
+            else:
+                json.dump(self.report(), f, indent=2)
+        log.debug(f"Metrics written to {path}")
+
+
+class CountingProxy:
+    """Forwards attribute access to a Playwright object, counting every browser round-trip."""
+
+    def __init__(self, target, metrics):
+        self._target = target
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if name in LAZY_ATTRIBUTES:
+            if callable(value):
+                return lambda *args, **kwargs: CountingProxy(value(*args, **kwargs), self._metrics)
+            return CountingProxy(value, self._metrics)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            self._metrics.count("playwright_calls")
+            result = value(*args, **kwargs)
+            return CountingProxy(result, self._metrics) if name in HANDLE_RETURNING else result
+
+        return call
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import re
+import time
+
+from playwright.async_api import async_playwright
+
+from batch_scraper import read_playlist_async
+from incremental import playlist_key
+from records import VideoRecord
+from result_cache import normalize_query
+from selector_resolver import get_default_resolver
+from Youtube_scraperV3 import (
+    PLAYLIST_LINK_SELECTORS, PLAYLIST_ROW_SELECTOR, ResourceBlocker, get_playlist_search_url, origin_of,
+    is_playlist_link, new_video_data,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TOP_N = 3
+
+# Relative weight of each ranking signal; every signal is scored in [0, 1]
+RANKING_WEIGHTS = {"videos": 0.25, "duration": 0.25, "english": 0.25, "relevance": 0.15, "channel": 0.10}
+# Playlists at least this long get the full video-count and duration scores
+TARGET_VIDEOS = 30
+TARGET_HOURS = 5
+# Title words that give away a non-English course despite the search filters
+NON_ENGLISH_MARKERS = (
+    "hindi", "urdu", "tamil", "telugu", "bangla", "bengali", "marathi", "kannada", "malayalam", "gujarati",
+    "español", "espanol", "português", "portugues", "français", "deutsch", "bahasa",
+)
+# Video titles sampled per playlist for the English heuristic
+TITLE_SAMPLE = 20
+
+# Title and href of every visible match of the winning playlist link selector
+PLAYLIST_CANDIDATES_JS = """
+els => els.filter(el => el.getClientRects().length).map(el => ({
+    title: (el.getAttribute('title') || (el.closest('h3') || el).textContent || '').trim(),
+    href: el.getAttribute('href')
+}))
+"""
+
+
+def english_score(title):
+    """Share of the title's letters that are ASCII, or 0 when it names another language."""
+    lowered = title.lower()
+    if any(re.search(rf"\b{marker}\b", lowered) for marker in NON_ENGLISH_MARKERS):
+        return 0.0
+    letters = [c for c in title if c.isalpha()]
+    if not letters:
+        return 0.0
+    return sum(c.isascii() for c in letters) / len(letters)
+
+
+def score_playlist(query, candidate):
+    """Return ``(score, signals, total_seconds)`` for a scraped candidate with ``playlist_info`` and ``videos``."""
+    info = candidate["playlist_info"]
+    videos = [VideoRecord.from_dict(v) for v in candidate["videos"]]
+    total_seconds = sum(v.duration_seconds for v in videos)
+    video_titles = [v.title for v in videos[:TITLE_SAMPLE]]
+    title_english = english_score(info.get("title", ""))
+    query_words = [w for w in normalize_query(query).split() if len(w) > 2]
+    title = info.get("title", "").lower()
+    channel = info.get("channel", "Unknown Channel")
+    # Single-author courses beat compilations of other channels' videos
+    own_videos = sum(v.channel == channel for v in videos)
+    signals = {
+        "videos": min(len(videos), TARGET_VIDEOS) / TARGET_VIDEOS,
+        "duration": min(total_seconds / 3600, TARGET_HOURS) / TARGET_HOURS,
+        # A playlist title naming another language caps the signal however English the videos look
+        "english": min(title_english, sum(map(english_score, video_titles)) / len(video_titles)) if video_titles else title_english,
+        "relevance": sum(w in title for w in query_words) / len(query_words) if query_words else 0.0,
+        "channel": own_videos / len(videos) if videos and channel != "Unknown Channel" else 0.0,
+    }
+    score = sum(RANKING_WEIGHTS[name] * value for name, value in signals.items())
+    return round(score, 4), {name: round(value, 3) for name, value in signals.items()}, total_seconds
+
+
+def rank_candidates(query, candidates):
+    """Score the scraped candidates and return them best first, each with ``score`` and ``signals``."""
+    ranked = []
+    for candidate in candidates:
+        score, signals, total_seconds = score_playlist(query, candidate)
+        ranked.append({**candidate, "score": score, "signals": signals, "total_duration_seconds": total_seconds})
+    # Ties keep the search order
+    return sorted(ranked, key=lambda c: -c["score"])
+
+
+async def find_playlist_candidates(page, resolver, top_n):
+    """Return up to ``top_n`` distinct playlists from the search results page, in search order."""
+    selector = await resolver.resolve_async(page, "search_playlist_link", PLAYLIST_LINK_SELECTORS)
+    links = await page.eval_on_selector_all(selector, PLAYLIST_CANDIDATES_JS)
+    base_url = origin_of(page.url)
+    candidates, seen = [], set()
+    for link in links:
+        if not is_playlist_link(link["href"]):
+            continue
+        list_id = playlist_key(link["href"])
+        if list_id in seen:
+            continue
+        seen.add(list_id)
+        candidates.append({"title": link["title"], "url": f"{base_url}/playlist?list={list_id}"})
+        if len(candidates) == top_n:
+            break
+    return candidates
+
+
+async def scrape_candidate_async(context, candidate, resolver, derive_thumbnails):
+    """Scrape one candidate playlist in its own tab of ``context``."""
+    page = await context.new_page()
+    try:
+        await page.goto(candidate["url"], wait_until='domcontentloaded')
+        await page.wait_for_selector(PLAYLIST_ROW_SELECTOR, timeout=10000)
+        channel, videos = await read_playlist_async(page, resolver, origin_of(candidate["url"]), derive_thumbnails,
+                                                    label=candidate["title"])
+        return {"playlist_info": {"title": candidate["title"], "channel": channel, "url": candidate["url"]},
+                "videos": videos}
+    finally:
+        await page.close()
+
+
+async def rank_playlists_async(course_name, top_n=DEFAULT_TOP_N, search_url=None, block_resources=False,
+                               resolver=None):
+    """Scrape the top ``top_n`` playlists for ``course_name`` concurrently and rank them.
+
+    All candidates load at once in separate tabs of one browser context,
+    so the whole pass takes about as long as the slowest single playlist.
+    Returns the best playlist in the usual output schema, with the full
+    ranking under ``metadata["ranking"]`` and the other scraped playlists
+    under ``alternatives``.
+    """
+    search_url = search_url or get_playlist_search_url(course_name)
+    resolver = resolver or get_default_resolver()
+    video_data = new_video_data("browser", search_url)
+    start = time.monotonic()
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context()
+            blocker = None
+            if block_resources:
+                blocker = ResourceBlocker()
+                await context.route("**/*", blocker.handle_async)
+            page = await context.new_page()
+            await page.goto(search_url, wait_until='domcontentloaded')
+            candidates = await find_playlist_candidates(page, resolver, top_n)
+            if not candidates:
+                raise Exception("Could not find any playlist items")
+            log.debug(f"Scraping {len(candidates)} playlist candidates: {[c['title'] for c in candidates]}")
+            await page.close()
+
+            results = await asyncio.gather(
+                *(scrape_candidate_async(context, c, resolver, block_resources) for c in candidates),
+                return_exceptions=True)
+        finally:
+            await browser.close()
+
+    scraped = [r for r in results if not isinstance(r, BaseException)]
+    failures = {c["url"]: str(r) for c, r in zip(candidates, results) if isinstance(r, BaseException)}
+    for url, error in failures.items():
+        log.warning(f"Candidate {url} failed: {error}")
+    if not scraped:
+        raise Exception(f"Every playlist candidate failed: {next(iter(failures.values()))}")
+
+    ranked = rank_candidates(course_name, scraped)
+    best = ranked[0]
+    video_data["playlist_info"] = best["playlist_info"]
+    video_data["videos"] = best["videos"]
+    video_data["metadata"]["ranking"] = [
+        {
+            "rank": i + 1,
+            **c["playlist_info"],
+            "videos": len(c["videos"]),
+            "total_duration_seconds": c["total_duration_seconds"],
+            "score": c["score"],
+            "signals": c["signals"],
+        }
+        for i, c in enumerate(ranked)
+    ]
+    if failures:
+        video_data["metadata"]["failed_candidates"] = failures
+    if blocker:
+        video_data["metadata"]["resource_blocking"] = blocker.report()
+    video_data["metadata"]["elapsed_seconds"] = round(time.monotonic() - start, 2)
+    video_data["alternatives"] = [
+        {"playlist_info": c["playlist_info"], "score": c["score"], "videos": c["videos"]} for c in ranked[1:]
+    ]
+    return video_data
+
+
+def rank_playlists(course_name, top_n=DEFAULT_TOP_N, search_url=None, block_resources=False, resolver=None):
+    return asyncio.run(rank_playlists_async(course_name, top_n, search_url, block_resources, resolver))
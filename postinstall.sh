@@ -1,2 +1,6 @@
 #!/bin/bash
-playwright install chromium
+# One-time setup: install Chromium for Playwright, check that headless
+# launches work and stamp it, so the app and the browser-based CLI modes
+# only look up the stamp at startup instead of probing or reinstalling
+python -m playwright install chromium
+python startup.py
@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+from Youtube_scraperV3 import parse_duration, video_id_from_url
+
+log = logging.getLogger(__name__)
+
+# Days per unit of YouTube's relative upload times ("3 years ago"); months and years are approximate
+RELATIVE_UNIT_DAYS = {"second": 1 / 86400, "minute": 1 / 1440, "hour": 1 / 24, "day": 1, "week": 7, "month": 30,
+                      "year": 365}
+VIEW_MULTIPLIERS = {"": 1, "K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+VIEWS_PATTERN = r'([\d.,]+)\s*([KMB]?)\s*views?'
+RELATIVE_DATE_PATTERN = r'(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago'
+
+# Columns added by enrichment, exported after the parsed fields when present
+ENRICHMENT_COLUMNS = ["publish_date", "like_count", "description", "chapters"]
+# Enrichment columns holding counts; nullable integers so missing values don't turn them into floats
+COUNT_COLUMNS = ["like_count"]
+
+
+def as_datetime(value):
+    if value is None:
+        return datetime.now()
+    if isinstance(value, str):
+        # Offsets are dropped; a day's precision is all that is needed here
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    return value
+
+
+@dataclass(slots=True)
+class VideoRecord:
+    """Compact typed form of a scraped video, with the display strings parsed once."""
+    video_id: str | None
+    title: str
+    channel: str
+    duration_seconds: int
+    view_count: int | None
+    published_approx: date | None
+    url: str
+    thumbnail: str | None = None
+
+    @classmethod
+    def from_dict(cls, video, scraped_at=None):
+        """Build a record from a scraped video dict; relative upload times count back from ``scraped_at``."""
+        # Enriched videos carry exact figures; prefer them over the parsed strings
+        view_count = video.get("view_count")
+        published = parse_iso_date(video.get("publish_date"))
+        return cls(
+            video_id=video_id_from_url(video.get("url")),
+            title=video.get("title", ""),
+            channel=video.get("channel", ""),
+            duration_seconds=parse_duration(video.get("duration") or ""),
+            view_count=view_count if view_count is not None else parse_view_count(video.get("views")),
+            published_approx=published or parse_relative_date(video.get("upload_time"), scraped_at),
+            url=video.get("url", ""),
+            thumbnail=video.get("thumbnail"),
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def parse_view_count(views_text):
+    """Convert "1.2M views", "12,345 views" or "No views" to an integer, None if unrecognised."""
+    if not views_text:
+        return None
+    if views_text.strip().lower().startswith("no views"):
+        return 0
+    match = re.search(VIEWS_PATTERN, views_text, re.IGNORECASE)
+    if not match:
+        return None
+    number = float(match.group(1).replace(",", ""))
+    return int(round(number * VIEW_MULTIPLIERS[match.group(2).upper()]))
+
+
+def parse_relative_date(upload_text, scraped_at=None):
+    """Approximate the date behind "3 years ago" (also "Streamed 2 days ago"), counting back from ``scraped_at``."""
+    if not upload_text:
+        return None
+    match = re.search(RELATIVE_DATE_PATTERN, upload_text, re.IGNORECASE)
+    if not match:
+        return None
+    reference = as_datetime(scraped_at)
+    return (reference - timedelta(days=int(match.group(1)) * RELATIVE_UNIT_DAYS[match.group(2).lower()])).date()
+
+
+def parse_iso_date(text):
+    try:
+        return date.fromisoformat(text[:10]) if text else None
+    except ValueError:
+        return None
+
+
+def to_records(video_data):
+    """Return the videos of a scrape result as ``VideoRecord`` objects."""
+    scraped_at = video_data.get("metadata", {}).get("scraped_at")
+    return [VideoRecord.from_dict(video, scraped_at) for video in video_data["videos"]]
+
+
+def parse_video_frame(videos, scraped_at=None):
+    """Parse a list of scraped video dicts into one typed row per video.
+
+    The vectorized counterpart of ``VideoRecord.from_dict`` for exports.
+
+    Returns a pandas DataFrame with ``video_id``, ``title``, ``channel``,
+    ``duration_seconds``, ``view_count`` (nullable integer),
+    ``published_approx`` (date), ``url`` and ``thumbnail``, plus the
+    enrichment columns when the videos carry them. Exact enrichment
+    figures win over the parsed display strings, and relative upload
+    times count back from ``scraped_at``. Each string column is parsed
+    in a handful of column-wide operations instead of per row.
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame(list(videos))
+    for column in ("url", "title", "channel", "duration", "views", "upload_time", "thumbnail"):
+        if column not in frame:
+            frame[column] = None
+    out = pd.DataFrame(index=frame.index)
+    out["video_id"] = frame["url"].str.extract(r'[?&]v=([^&#]+)', expand=False)
+    out["title"] = frame["title"]
+    out["channel"] = frame["channel"]
+
+    out["duration_seconds"] = frame["duration"].fillna("").map(parse_duration).astype("int64")
+
+    views = frame["views"].str.extract(VIEWS_PATTERN, flags=re.IGNORECASE)
+    counts = pd.to_numeric(views[0].str.replace(",", "", regex=False)) * views[1].str.upper().map(VIEW_MULTIPLIERS)
+    counts = counts.mask(frame["views"].str.strip().str.lower().str.startswith("no views", na=False), 0)
+    if "view_count" in frame:
+        counts = pd.to_numeric(frame["view_count"]).fillna(counts)
+    out["view_count"] = counts.round().astype("Int64")
+
+    relative = frame["upload_time"].str.extract(RELATIVE_DATE_PATTERN, flags=re.IGNORECASE)
+    days = pd.to_numeric(relative[0]) * relative[1].str.lower().map(RELATIVE_UNIT_DAYS)
+    published = (pd.Timestamp(as_datetime(scraped_at)) - pd.to_timedelta(days, unit="D")).dt.normalize()
+    if "publish_date" in frame:
+        exact = pd.to_datetime(frame["publish_date"].str[:10], errors="coerce")
+        published = exact.fillna(published)
+    out["published_approx"] = published.dt.date
+
+    out["url"] = frame["url"]
+    out["thumbnail"] = frame["thumbnail"]
+    for column in ENRICHMENT_COLUMNS:
+        if column in frame:
+            out[column] = pd.to_numeric(frame[column]).astype("Int64") if column in COUNT_COLUMNS else frame[column]
+    return out
+
+
+def save_to_table(video_data, output_dir="output", fmt="csv", filename=None):
+    """Write the videos of a scrape result as CSV or Parquet, one row per video; returns the path.
+
+    Parquet needs pyarrow (or fastparquet), which is optional. Chapters are
+    stored as JSON text in CSV and as nested lists in Parquet.
+    """
+    frame = parse_video_frame(video_data["videos"], video_data.get("metadata", {}).get("scraped_at"))
+    os.makedirs(output_dir, exist_ok=True)
+    if filename is None:
+        filename = f"youtube_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    filepath = os.path.join(output_dir, filename)
+
+    if fmt == "csv":
+        if "chapters" in frame:
+            frame["chapters"] = frame["chapters"].map(
+                lambda chapters: json.dumps(chapters, ensure_ascii=False) if isinstance(chapters, list) else None)
+        frame.to_csv(filepath, index=False)
+    elif fmt == "parquet":
+        try:
+            frame.to_parquet(filepath, index=False)
+        except ImportError as e:
+            raise Exception(f"Parquet export needs pyarrow (pip install pyarrow): {e}")
+    else:
+        raise ValueError(f"Unsupported table format: {fmt}")
+    log.debug(f"Data saved to {filepath}")
+    return filepath
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "results.sqlite3")
+DEFAULT_TTL = 24 * 3600  # seconds
+DEFAULT_MAX_ENTRIES = 500
+
+
+def normalize_query(course_name):
+    """Lowercase and collapse whitespace so equivalent queries share a cache entry."""
+    return " ".join(course_name.lower().split())
+
+
+def cache_key(query, search_url):
+    return hashlib.sha256(f"{query}\n{search_url}".encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Scrape results stored in SQLite with a TTL and size-bounded LRU eviction.
+
+    Hit and miss counters are persisted alongside the results so they
+    survive restarts. Safe to share between threads.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, query TEXT, search_url TEXT, data TEXT, "
+                "created_at REAL, accessed_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)")
+            self._db.execute("INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0)")
+
+    def _count(self, name):
+        self._db.execute("UPDATE stats SET value = value + 1 WHERE name = ?", (name,))
+
+    def get(self, query, search_url):
+        """Return the cached result for the query, or None if missing or expired."""
+        key = cache_key(query, search_url)
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute("SELECT data, created_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] < self.ttl:
+                self._db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+                self._count("hits")
+                return json.loads(row[0])
+            if row:
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._count("misses")
+        return None
+
+    def put(self, query, search_url, data):
+        """Store a result and evict the least recently used entries beyond ``max_entries``."""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key(query, search_url), query, search_url, json.dumps(data, ensure_ascii=False), now, now),
+            )
+            self._db.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._db.execute("SELECT name, value FROM stats"))
+            counters["entries"] = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return counters
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM results")
+
+    def close(self):
+        self._db.close()
+
+
+def get_or_scrape(cache, course_name, build_search_url, scrape, refresh=False):
+    """Return the cached result for ``course_name`` or run ``scrape()`` and cache it.
+
+    The entry is keyed by the normalized query and the search URL that
+    ``build_search_url`` produces for it, so scrapers with different search
+    URLs never share results. ``refresh`` skips the lookup but still stores
+    the fresh result. Returns ``(video_data, from_cache)``.
+    """
+    query = normalize_query(course_name)
+    search_url = build_search_url(query)
+    if not refresh:
+        video_data = cache.get(query, search_url)
+        if video_data is not None:
+            log.debug(f"Cache hit for '{query}'")
+            return video_data, True
+    video_data = scrape()
+    cache.put(query, search_url, video_data)
+    return video_data, False
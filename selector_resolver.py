@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+DEFAULT_STATS_PATH = os.path.join(".cache", "selector_stats.json")
+
+# Resolves to the first candidate (in the given order) with a visible match
+FIRST_VISIBLE_JS = """
+selectors => {
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            if (el.getClientRects().length && getComputedStyle(el).visibility !== 'hidden') {
+                return selector;
+            }
+        }
+    }
+    return false;
+}
+"""
+
+
+class SelectorResolutionError(Exception):
+    """Raised when none of the candidate selectors matched in time."""
+
+
+class SelectorResolver:
+    """Waits on several candidate selectors at once and remembers which one wins.
+
+    Candidates are raced in a single ``wait_for_function`` call, ordered so
+    that the recent winner for the page type is preferred when several
+    match. Per-selector wins, losses and latency are kept per page type and
+    persisted as JSON, to keep an eye on YouTube layout drift.
+    """
+
+    def __init__(self, path=DEFAULT_STATS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._stats = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning(f"Ignoring unreadable selector stats {path}: {e}")
+
+    def order(self, page_type, candidates):
+        """Return the candidates with the last winner first, then by number of wins."""
+        with self._lock:
+            entry = self._stats.get(page_type, {})
+            wins = {selector: s["hits"] for selector, s in entry.get("selectors", {}).items()}
+            last_winner = entry.get("last_winner")
+        return sorted(candidates, key=lambda s: (s != last_winner, -wins.get(s, 0), candidates.index(s)))
+
+    def resolve(self, page, page_type, candidates, timeout=10000):
+        """Return the winning selector on ``page``, raising ``SelectorResolutionError`` on timeout."""
+        ordered = self.order(page_type, candidates)
+        start = time.monotonic()
+        try:
+            winner = page.wait_for_function(FIRST_VISIBLE_JS, arg=ordered, timeout=timeout).json_value()
+        except Exception as e:
+            self.record(page_type, candidates, None, (time.monotonic() - start) * 1000)
+            raise SelectorResolutionError(f"No {page_type} selector matched: {e}")
+        self.record(page_type, candidates, winner, (time.monotonic() - start) * 1000)
+        return winner
+
+    async def resolve_async(self, page, page_type, candidates, timeout=10000):
+        """Async API counterpart of ``resolve``."""
+        ordered = self.order(page_type, candidates)
+        start = time.monotonic()
+        try:
+            handle = await page.wait_for_function(FIRST_VISIBLE_JS, arg=ordered, timeout=timeout)
+            winner = await handle.json_value()
+        except Exception as e:
+            self.record(page_type, candidates, None, (time.monotonic() - start) * 1000)
+            raise SelectorResolutionError(f"No {page_type} selector matched: {e}")
+        self.record(page_type, candidates, winner, (time.monotonic() - start) * 1000)
+        return winner
+
+    def record(self, page_type, candidates, winner, latency_ms):
+        with self._lock:
+            entry = self._stats.setdefault(page_type, {"last_winner": None, "failures": 0, "selectors": {}})
+            for selector in candidates:
+                s = entry["selectors"].setdefault(selector, {"hits": 0, "misses": 0, "total_latency_ms": 0.0})
+                if selector == winner:
+                    s["hits"] += 1
+                    s["total_latency_ms"] += latency_ms
+                else:
+                    s["misses"] += 1
+            if winner is None:
+                entry["failures"] += 1
+            else:
+                entry["last_winner"] = winner
+            log.debug(f"Resolved {page_type} selector {winner!r} in {latency_ms:.0f}ms")
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._stats, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning(f"Could not save selector stats to {self.path}: {e}")
+
+    def stats(self):
+        """Return per page type hit/miss counts and average winning latency per selector."""
+        with self._lock:
+            report = {}
+            for page_type, entry in self._stats.items():
+                report[page_type] = {
+                    "last_winner": entry["last_winner"],
+                    "failures": entry["failures"],
+                    "selectors": {
+                        selector: {
+                            "hits": s["hits"],
+                            "misses": s["misses"],
+                            "avg_latency_ms": round(s["total_latency_ms"] / s["hits"], 1) if s["hits"] else None,
+                        }
+                        for selector, s in entry["selectors"].items()
+                    },
+                }
+            return report
+
+
+_default_resolver = None
+
+
+def get_default_resolver():
+    """Return the process-wide resolver backed by ``DEFAULT_STATS_PATH``."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = SelectorResolver()
+    return _default_resolver
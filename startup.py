@@ -0,0 +1,178 @@
+import argparse
+import importlib.metadata
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+BROWSER_STAMP_PATH = os.path.join(".cache", "browser_stamp.json")
+RENDER_TIMES_PATH = os.path.join(".cache", "render_times.jsonl")
+INSTALL_LOCK_STALE = 900  # seconds after which an abandoned install lock is ignored
+
+
+class BrowserNotInstalledError(Exception):
+    """Raised when the Chromium build Playwright expects is missing and may not be installed."""
+
+
+def playwright_version():
+    try:
+        return importlib.metadata.version("playwright")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def read_stamp(path=BROWSER_STAMP_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_stamp(location, path=BROWSER_STAMP_PATH):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"playwright_version": playwright_version(), "headless_shell": location, "checked_at": time.time()}, f)
+
+
+def stamp_is_valid(stamp):
+    """A stamp holds while Playwright hasn't been upgraded and the recorded browser build still exists."""
+    return bool(stamp) and stamp.get("playwright_version") == playwright_version() \
+        and os.path.exists(stamp.get("headless_shell") or "")
+
+
+def headless_shell_location():
+    """Install directory of the chromium-headless-shell build, as reported by Playwright; None if unknown.
+
+    Headless launches run this build, not the full Chrome at
+    ``chromium.executable_path``, so it is the one worth checking for.
+    """
+    try:
+        output = subprocess.run([sys.executable, "-m", "playwright", "install", "--dry-run", "--only-shell", "chromium"],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        log.debug(f"Could not ask Playwright for the headless shell location: {e}")
+        return None
+    match = re.search(r'Install location:\s*(.+)', output)
+    return match.group(1).strip() if match else None
+
+
+def probe_headless_launch():
+    """Launch and close headless Chromium once; returns None if it works, else the launch error."""
+    from playwright.sync_api import sync_playwright
+    try:
+        with sync_playwright() as playwright:
+            playwright.chromium.launch(headless=True).close()
+    except Exception as e:
+        return str(e).splitlines()[0]
+    return None
+
+
+def is_missing_browser_error(error):
+    return "Executable doesn't exist" in error
+
+
+def install_chromium():
+    log.info("Installing Playwright Chromium (one-time)")
+    try:
+        subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise BrowserNotInstalledError(f"Installing Chromium failed: {e}")
+
+
+@contextmanager
+def install_lock(path, timeout=INSTALL_LOCK_STALE):
+    """Cross-process lock so concurrent app processes run the install only once."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > INSTALL_LOCK_STALE:
+                    log.warning(f"Removing stale install lock {path}")
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise BrowserNotInstalledError(f"Timed out waiting for another install to finish ({path})")
+            time.sleep(1)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(path)
+
+
+def ensure_browser(install=False, stamp_path=BROWSER_STAMP_PATH):
+    """Make sure headless Chromium launches and return the build it runs from.
+
+    A valid version stamp makes this a single file check. Otherwise one
+    headless launch is tried; if its binary is missing it is installed
+    when ``install`` is set and ``BrowserNotInstalledError`` is raised
+    when not. Any other launch failure (e.g. missing system libraries)
+    raises too. A working browser is stamped so later checks stay cheap.
+    """
+    stamp = read_stamp(stamp_path)
+    if stamp_is_valid(stamp):
+        return stamp["headless_shell"]
+
+    start = time.monotonic()
+    error = probe_headless_launch()
+    if error and is_missing_browser_error(error):
+        if not install:
+            raise BrowserNotInstalledError(
+                "Chromium for Playwright is not installed; run postinstall.sh or 'python -m playwright install chromium'")
+        with install_lock(f"{stamp_path}.lock"):
+            # Another process may have finished the install while we waited
+            error = probe_headless_launch()
+            if error and is_missing_browser_error(error):
+                install_chromium()
+                error = probe_headless_launch()
+    if error:
+        raise BrowserNotInstalledError(f"Headless Chromium does not launch: {error}")
+    location = headless_shell_location()
+    # Without a known location the stamp stays invalid and the next check probes again
+    write_stamp(location, stamp_path)
+    log.debug(f"Browser check took {(time.monotonic() - start) * 1000:.0f}ms: {location}")
+    return location
+
+
+def record_render(elapsed_ms, first_in_process, path=RENDER_TIMES_PATH):
+    """Append a script run's render time to a JSONL log for watching startup regressions."""
+    log.info(f"{'First render' if first_in_process else 'Rerun'} took {elapsed_ms:.0f}ms")
+    try:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"at": time.time(), "first_in_process": first_in_process,
+                                "elapsed_ms": round(elapsed_ms, 1)}) + "\n")
+    except OSError as e:
+        log.warning(f"Could not record render time to {path}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check (and optionally install) the Playwright browser once')
+    parser.add_argument('--install', action='store_true', help='Install Chromium if it is missing')
+    args = parser.parse_args()
+    try:
+        print(f"Chromium: {ensure_browser(install=args.install)}")
+    except BrowserNotInstalledError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
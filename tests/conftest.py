@@ -0,0 +1,11 @@
+import pytest
+
+from benchmarks.fixture_server import start_fixture_server
+
+
+@pytest.fixture(scope="session")
+def fixture_site():
+    """Base URL of a local server replaying the generated benchmark fixtures."""
+    server, base_url = start_fixture_server()
+    yield base_url
+    server.shutdown()
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from enrichment import EnrichmentCheckpoint, enrich_videos, parse_watch_page
+
+PLAYER = {
+    "videoDetails": {"videoId": "ok", "shortDescription": "0:00 Intro\n1:00 Basics\n2:30 Wrap up", "viewCount": "1234"},
+    "microformat": {"playerMicroformatRenderer": {"publishDate": "2024-05-01T00:00:00-07:00"}},
+}
+
+
+def watch_page(player):
+    return f"<html><script>var ytInitialPlayerResponse = {json.dumps(player)};</script></html>"
+
+
+@pytest.fixture
+def watch_server():
+    """Serves watch pages: ``ok`` succeeds, ``gone`` 404s, ``flaky`` 503s once, ``private`` has no details."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            video_id = self.path.rsplit("v=", 1)[-1]
+            requests_seen.append(video_id)
+            if video_id == "gone" or (video_id == "flaky" and requests_seen.count("flaky") == 1):
+                status, body = (404 if video_id == "gone" else 503), b"error"
+            elif video_id == "private":
+                status, body = 200, watch_page({"playabilityStatus": {"status": "LOGIN_REQUIRED"}}).encode()
+            else:
+                status, body = 200, watch_page({**PLAYER, "videoDetails": {**PLAYER["videoDetails"], "videoId": video_id}}).encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests_seen
+    server.shutdown()
+
+
+def videos_for(base_url, *ids):
+    return [{"title": i, "url": f"{base_url}/watch?v={i}&list=PLtest"} for i in ids]
+
+
+def test_parse_watch_page():
+    details = parse_watch_page(watch_page(PLAYER))
+    assert details["view_count"] == 1234
+    assert details["publish_date"] == "2024-05-01T00:00:00-07:00"
+    assert [c["start_seconds"] for c in details["chapters"]] == [0, 60, 150]
+
+
+def test_only_transient_failures_are_retried(watch_server):
+    base_url, seen = watch_server
+    videos = videos_for(base_url, "ok", "gone", "flaky", "private")
+    stats = enrich_videos(videos, concurrency=2, retries=2, backoff=0.01)
+    assert stats["enriched"] == 2 and stats["failed"] == 2
+    assert seen.count("gone") == 1
+    assert seen.count("private") == 1
+    assert seen.count("flaky") == 2
+    by_id = {v["title"]: v for v in videos}
+    assert by_id["flaky"]["view_count"] == 1234
+    assert "enrichment_error" in by_id["gone"] and "enrichment_error" in by_id["private"]
+
+
+def test_checkpoint_resumes_fresh_entries(watch_server, tmp_path):
+    base_url, seen = watch_server
+    path = str(tmp_path / "checkpoint.jsonl")
+    enrich_videos(videos_for(base_url, "ok"), checkpoint_path=path)
+    videos = videos_for(base_url, "ok")
+    stats = enrich_videos(videos, checkpoint_path=path)
+    assert stats["from_checkpoint"] == 1
+    assert seen.count("ok") == 1
+    assert videos[0]["view_count"] == 1234
+
+
+def test_checkpoint_drops_stale_entries(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    entries = [
+        {"video_id": "old", "details": {"view_count": 1}, "fetched_at": time.time() - 7200},
+        {"video_id": "legacy", "details": {"view_count": 2}},
+        {"video_id": "new", "details": {"view_count": 3}, "fetched_at": time.time() - 60},
+    ]
+    path.write_text("".join(json.dumps(e) + "\n" for e in entries) + '{"video_id": "cut', encoding="utf-8")
+    checkpoint = EnrichmentCheckpoint(str(path), max_age=3600)
+    checkpoint.close()
+    assert checkpoint.done == {"new": {"view_count": 3}}
+    assert [json.loads(line)["video_id"] for line in path.read_text(encoding="utf-8").splitlines()] == ["new"]
@@ -0,0 +1,120 @@
+import pytest
+
+import Youtube_scraperV3
+from benchmarks.fixtures import CASES, CHANNEL, PAGE_SIZE, playlist_id
+from http_engine import (
+    HttpEngineError, extract_initial_data, fetch_html, parse_advertised_count, parse_playlist_rows,
+    parse_search_playlists, scrape_playlist_http,
+)
+from metrics import ScrapeMetrics
+
+
+def expected_videos(case):
+    # Every 10th fixture video is a short the duration filter drops
+    return CASES[case] - CASES[case] // 10
+
+
+def test_parse_search_playlists(fixture_site):
+    data = extract_initial_data(fetch_html(f"{fixture_site}/results?search_query=medium+course"))
+    playlists = parse_search_playlists(data)
+    assert playlists == [{
+        "title": "Medium course (200 videos)",
+        "href": f"/playlist?list={playlist_id('medium')}",
+        "channel": None,
+        "playlist_id": playlist_id("medium"),
+    }]
+
+
+def test_parse_playlist_rows_first_page(fixture_site):
+    data = extract_initial_data(fetch_html(f"{fixture_site}/playlist?list={playlist_id('medium')}"))
+    rows, token = parse_playlist_rows(data)
+    assert len(rows) == PAGE_SIZE
+    assert token == f"medium:{PAGE_SIZE}"
+    assert rows[0]["title"] == "Medium lesson 1"
+    assert rows[0]["href"].startswith("/watch?v=me000000000&")
+    assert rows[0]["channel"] == CHANNEL
+    assert rows[0]["metadata"] == ["1K views", "1 years ago"]
+    assert parse_advertised_count(data) == CASES["medium"]
+
+
+def test_parse_playlist_rows_last_page_has_no_token(fixture_site):
+    data = extract_initial_data(fetch_html(f"{fixture_site}/playlist?list={playlist_id('small')}"))
+    rows, token = parse_playlist_rows(data)
+    assert len(rows) == CASES["small"]
+    assert token is None
+
+
+@pytest.mark.parametrize("case", ["small", "medium", "large"])
+def test_scrape_follows_continuations(fixture_site, case):
+    metrics = ScrapeMetrics()
+    video_data = scrape_playlist_http(f"{case} course", base_url=fixture_site, metrics=metrics)
+    videos = video_data["videos"]
+    assert len(videos) == expected_videos(case)
+    assert len({v["url"] for v in videos}) == len(videos)
+    assert videos[-1]["title"] == f"{case.title()} lesson {CASES[case] - 1}"
+    assert video_data["playlist_info"] == {
+        "title": f"{case.title()} course ({CASES[case]} videos)",
+        "channel": CHANNEL,
+        "url": f"{fixture_site}/playlist?list={playlist_id(case)}",
+    }
+    assert video_data["metadata"]["engine"] == "http"
+    # Search page, playlist page and one request per continuation
+    pages = -(-CASES[case] // PAGE_SIZE)
+    assert video_data["metadata"]["metrics"]["counters"]["http_requests"] == 1 + pages
+
+
+def test_unknown_query_raises(fixture_site):
+    with pytest.raises(HttpEngineError):
+        scrape_playlist_http("unknown topic", base_url=fixture_site)
+
+
+def fake_browser_scrape(calls):
+    def iter_scrape(course_name, **kwargs):
+        calls.append(course_name)
+        yield "playlist_info", {"title": "from browser", "channel": CHANNEL, "url": ""}
+        yield "metadata", {"engine": "browser"}
+    return iter_scrape
+
+
+def test_http_engine_falls_back_to_browser(fixture_site, monkeypatch):
+    calls = []
+    monkeypatch.setenv("YOUTUBE_BASE_URL", fixture_site)
+    monkeypatch.setattr(Youtube_scraperV3, "iter_scrape_youtube_browser", fake_browser_scrape(calls))
+    video_data = Youtube_scraperV3.fetch_playlist_data("unknown topic", engine="http")
+    assert calls == ["unknown topic"]
+    assert video_data["metadata"]["engine"] == "browser"
+
+
+def test_http_engine_does_not_fall_back_once_started(fixture_site, monkeypatch):
+    import http_engine
+
+    def broken_continuation(*args, **kwargs):
+        raise HttpEngineError("continuation failed")
+
+    calls = []
+    monkeypatch.setenv("YOUTUBE_BASE_URL", fixture_site)
+    monkeypatch.setattr(Youtube_scraperV3, "iter_scrape_youtube_browser", fake_browser_scrape(calls))
+    monkeypatch.setattr(http_engine, "fetch_continuation", broken_continuation)
+    with pytest.raises(HttpEngineError, match="continuation failed"):
+        Youtube_scraperV3.fetch_playlist_data("medium course", engine="http")
+    assert calls == []
+
+
+def test_http_engine_without_fallback_when_it_succeeds(fixture_site, monkeypatch):
+    calls = []
+    monkeypatch.setenv("YOUTUBE_BASE_URL", fixture_site)
+    monkeypatch.setattr(Youtube_scraperV3, "iter_scrape_youtube_browser", fake_browser_scrape(calls))
+    video_data = Youtube_scraperV3.fetch_playlist_data("small course", engine="http")
+    assert calls == []
+    assert len(video_data["videos"]) == expected_videos("small")
+
+
+def test_advertised_count_ignores_numbers_outside_the_stats():
+    header = {"playlistHeaderRenderer": {
+        "title": {"simpleText": "Top 100 videos of 2024"},
+        "descriptionText": {"simpleText": "All 12 videos in one place"},
+        "numVideosText": {"runs": [{"text": "1,234"}, {"text": " videos"}]},
+    }}
+    assert parse_advertised_count({"header": header}) == 1234
+    del header["playlistHeaderRenderer"]["numVideosText"]
+    assert parse_advertised_count({"header": header}) is None
@@ -0,0 +1,116 @@
+from incremental import PlaylistStateStore, find_resume_point, merge_with_state, playlist_key, refresh_state
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLtest"
+
+
+def video(video_id, **fields):
+    return {"title": f"Video {video_id}", "url": f"https://www.youtube.com/watch?v={video_id}&list=PLtest",
+            "duration": "10:00", **fields}
+
+
+def state_for(ids):
+    return {"row_ids": list(ids), "videos": [video(i) for i in ids]}
+
+
+def test_playlist_key_matches_watch_and_playlist_urls():
+    assert playlist_key(PLAYLIST_URL) == "PLtest"
+    assert playlist_key("https://www.youtube.com/watch?v=a&list=PLtest&index=2") == "PLtest"
+
+
+def test_resume_point_after_anchor_run():
+    known = ["a", "b", "c", "d", "e"]
+    # One new row at the top, then three rows lining up with the stored order
+    assert find_resume_point(["new", "a", "b", "c"], known, 6) == 2
+
+
+def test_no_resume_point_when_counts_disagree():
+    known = ["a", "b", "c", "d", "e"]
+    # A row was also added further down, so the stored rest can't be trusted
+    assert find_resume_point(["new", "a", "b", "c"], known, 7) is None
+    assert find_resume_point(["new", "a", "b", "c"], known, None) is None
+
+
+def test_no_resume_point_without_a_full_anchor():
+    known = ["a", "b", "c", "d", "e"]
+    assert find_resume_point(["a", "b"], known, 5) is None
+    assert find_resume_point(["x", "b", "c"], known, 5) is None
+    assert find_resume_point(["c", "b", "a"], known, 5) is None
+    assert find_resume_point(["x", "y", "z"], known, 5) is None
+
+
+def test_merge_reuses_stored_rest_and_reports_delta():
+    state = state_for(["a", "b", "c", "d", "e"])
+    loaded = ["new", "a", "b", "c"]
+    videos = [video("new"), video("a"), video("b", title="Renamed"), video("c")]
+    row_ids, merged, delta, reused = merge_with_state(state, loaded, videos, 6)
+    assert row_ids == ["new", "a", "b", "c", "d", "e"]
+    assert [v["title"] for v in merged] == ["Video new", "Video a", "Renamed", "Video c", "Video d", "Video e"]
+    assert reused == 2
+    assert [v["title"] for v in delta["added"]] == ["Video new"]
+    assert delta["changed"] == [{"video_id": "b", "title": "Renamed", "changes": {"title": ["Video b", "Renamed"]}}]
+    assert delta["removed"] == []
+
+
+def test_merge_without_resume_point_reports_removed_rows():
+    state = state_for(["a", "b", "c", "d"])
+    loaded = ["a", "b", "d"]
+    row_ids, merged, delta, reused = merge_with_state(state, loaded, [video(i) for i in loaded], 3)
+    assert row_ids == loaded
+    assert reused == 0
+    assert [v["title"] for v in delta["removed"]] == ["Video c"]
+    assert delta["added"] == delta["changed"] == []
+
+
+def test_merge_of_truncated_load_keeps_unloaded_rows():
+    state = state_for(["a", "b", "c", "d", "e"])
+    # The playlist grew by one, but loading timed out after three rows
+    loaded = ["new", "a", "b"]
+    row_ids, merged, delta, reused = merge_with_state(state, loaded, [video(i) for i in loaded], 6)
+    assert row_ids == ["new", "a", "b", "c", "d", "e"]
+    assert [v["title"] for v in merged] == ["Video new", "Video a", "Video b", "Video c", "Video d", "Video e"]
+    assert reused == 3
+    assert delta["removed"] == []
+    assert [v["title"] for v in delta["added"]] == ["Video new"]
+
+
+def test_truncated_refresh_saves_unloaded_rows(tmp_path):
+    store = PlaylistStateStore(str(tmp_path / "playlists.sqlite3"))
+    try:
+        state = state_for(["a", "b", "c", "d"])
+        store.save(PLAYLIST_URL, state["row_ids"], state["videos"])
+        reused, delta, stats = refresh_state(store, PLAYLIST_URL, state, ["new", "a"], [video("new"), video("a")], 5)
+        assert stats["removed"] == 0 and stats["added"] == 1
+        assert [v["title"] for v in reused] == ["Video b", "Video c", "Video d"]
+        assert store.load(PLAYLIST_URL)["row_ids"] == ["new", "a", "b", "c", "d"]
+        # A complete run afterwards finds nothing new
+        loaded = ["new", "a", "b", "c", "d"]
+        _, delta, stats = refresh_state(store, PLAYLIST_URL, store.load(PLAYLIST_URL), loaded,
+                                        [video(i) for i in loaded], 5)
+        assert stats["added"] == stats["removed"] == 0
+    finally:
+        store.close()
+
+
+def test_merge_first_run_adds_everything():
+    row_ids, merged, delta, reused = merge_with_state(None, ["a", "b"], [video("a"), video("b")], 2)
+    assert row_ids == ["a", "b"]
+    assert len(delta["added"]) == 2
+    assert reused == 0
+
+
+def test_refresh_state_saves_merged_snapshot(tmp_path):
+    store = PlaylistStateStore(str(tmp_path / "playlists.sqlite3"))
+    try:
+        reused, delta, stats = refresh_state(store, PLAYLIST_URL, None, ["a", "b", "c"],
+                                             [video("a"), video("b"), video("c")], 3)
+        assert reused == [] and stats["first_run"] and stats["added"] == 3
+
+        state = store.load("https://www.youtube.com/watch?v=a&list=PLtest")
+        assert state["row_ids"] == ["a", "b", "c"]
+        reused, delta, stats = refresh_state(store, PLAYLIST_URL, state, ["new", "a", "b", "c"],
+                                             [video("new"), video("a"), video("b"), video("c")], 4)
+        assert stats == {"first_run": False, "rows_loaded": 4, "rows_reused": 0, "added": 1, "removed": 0,
+                         "changed": 0}
+        assert store.load(PLAYLIST_URL)["row_ids"] == ["new", "a", "b", "c"]
+    finally:
+        store.close()
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from job_queue import JobQueue, QueueFullError
+
+
+def wait_for(queue, job_id, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {queue.get(job_id)}")
+
+
+def blocking_scrape(release, title="playlist"):
+    def scrape():
+        yield "playlist_info", {"title": title}
+        release.wait(5)
+        yield "video", {"title": "video 1"}
+        yield "metadata", {"engine": "test"}
+    return scrape
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(workers=1, max_pending=2)
+    yield queue
+    queue.close(timeout=5)
+
+
+def test_identical_queries_join_the_running_job(queue):
+    release = threading.Event()
+    calls = []
+
+    def scrape():
+        calls.append(1)
+        return blocking_scrape(release)()
+
+    first = queue.submit("python", scrape)
+    wait_for(queue, first, "running")
+    assert queue.submit("python", scrape) == first
+    release.set()
+    job = wait_for(queue, first, "done")
+    assert len(calls) == 1
+    assert job["result"]["videos"] == [{"title": "video 1"}]
+    # Finished jobs no longer absorb new submissions
+    assert queue.submit("python", scrape) != first
+
+
+def test_progress_is_visible_while_running(queue):
+    release = threading.Event()
+    job_id = queue.submit("python", blocking_scrape(release))
+    deadline = time.monotonic() + 5
+    while queue.get(job_id)["playlist_info"] is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    job = queue.get(job_id)
+    assert job["status"] == "running"
+    assert job["playlist_info"] == {"title": "playlist"}
+    assert job["videos"] == []
+    release.set()
+    wait_for(queue, job_id, "done")
+
+
+def test_full_queue_rejects_new_keys(queue):
+    release = threading.Event()
+    running = queue.submit("a", blocking_scrape(release))
+    wait_for(queue, running, "running")
+    second = queue.submit("b", blocking_scrape(release))
+    third = queue.submit("c", blocking_scrape(release))
+    assert queue.get(second)["position"] == 1
+    assert queue.get(third)["position"] == 2
+    with pytest.raises(QueueFullError):
+        queue.submit("d", blocking_scrape(release))
+    # Joining a queued job needs no extra slot
+    assert queue.submit("c", blocking_scrape(release)) == third
+    assert queue.stats() == {"pending": 2, "running": 1, "jobs": 3}
+    release.set()
+    for job_id in (running, second, third):
+        wait_for(queue, job_id, "done")
+
+
+def test_failed_scrape_is_reported_and_skips_on_done(queue):
+    done = []
+
+    def scrape():
+        yield "playlist_info", {"title": "playlist"}
+        raise RuntimeError("selector not found")
+
+    job_id = queue.submit("python", scrape, on_done=done.append)
+    job = wait_for(queue, job_id, "failed")
+    assert job["error"] == "selector not found"
+    assert job["result"] is None
+    assert done == []
+
+
+def test_on_done_receives_the_result(queue):
+    done = []
+    release = threading.Event()
+    release.set()
+    job_id = queue.submit("python", blocking_scrape(release), on_done=done.append)
+    job = wait_for(queue, job_id, "done")
+    assert done == [job["result"]]
+
+
+def test_closed_queue_rejects_jobs():
+    queue = JobQueue(workers=1)
+    queue.close(timeout=5)
+    with pytest.raises(QueueFullError):
+        queue.submit("python", blocking_scrape(threading.Event()))
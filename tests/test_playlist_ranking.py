@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+
+import Youtube_scraperV3
+from playlist_ranking import TARGET_HOURS, TARGET_VIDEOS, english_score, rank_candidates, score_playlist
+
+
+def candidate(title, video_count=10, duration="10:00", channel="Teacher", video_title="Lesson"):
+    videos = [{"title": f"{video_title} {i}", "duration": duration, "channel": channel} for i in range(video_count)]
+    return {"playlist_info": {"title": title, "channel": channel, "url": f"https://example.com/{title}"},
+            "videos": videos}
+
+
+def test_english_score_counts_ascii_letters():
+    assert english_score("Python Course") == 1.0
+    assert english_score("Café") == 0.75
+    assert english_score("123 !!") == 0.0
+
+
+@pytest.mark.parametrize("title", ["Python Course in Hindi", "Curso de Python en Español", "DEUTSCH Kurs"])
+def test_english_score_zeroes_non_english_titles(title):
+    assert english_score(title) == 0.0
+
+
+def test_english_score_matches_whole_words_only():
+    # "bahasa" is a marker, "bahasanator" is not
+    assert english_score("The bahasanator tutorial") == 1.0
+
+
+def test_non_english_playlist_title_caps_english_signal():
+    _, signals, _ = score_playlist("python", candidate("Python in Hindi"))
+    assert signals["english"] == 0.0
+    _, signals, _ = score_playlist("python", candidate("Python", video_title="Python in Tamil"))
+    assert signals["english"] == 0.0
+
+
+def test_video_and_duration_signals_cap_at_targets():
+    hours_per_video = "1:00:00"
+    at_target = candidate("Python", TARGET_VIDEOS, hours_per_video)
+    beyond = candidate("Python", TARGET_VIDEOS * 2, hours_per_video)
+    score, signals, total_seconds = score_playlist("python", at_target)
+    assert signals["videos"] == 1.0 and signals["duration"] == 1.0
+    assert total_seconds == TARGET_VIDEOS * 3600
+    assert score_playlist("python", beyond)[0] == score
+
+    # Half the target count, each video a 1/TARGET_VIDEOS share of the target hours
+    half = candidate("Python", TARGET_VIDEOS // 2, f"{TARGET_HOURS * 60 // TARGET_VIDEOS}:00")
+    _, signals, _ = score_playlist("python", half)
+    assert signals["videos"] == 0.5
+    assert signals["duration"] == 0.5
+
+
+def test_playlist_without_videos_scores_title_only():
+    score, signals, total_seconds = score_playlist("python course", candidate("Python Course", video_count=0))
+    assert total_seconds == 0
+    assert signals == {"videos": 0.0, "duration": 0.0, "english": 1.0, "relevance": 1.0, "channel": 0.0}
+    assert score == 0.4
+
+
+def test_rank_candidates_orders_by_score():
+    short = candidate("Python", video_count=2)
+    long = candidate("Python", video_count=20)
+    ranked = rank_candidates("python", [short, long])
+    assert [len(c["videos"]) for c in ranked] == [20, 2]
+    assert ranked[0]["score"] > ranked[1]["score"]
+    assert ranked[0]["total_duration_seconds"] == 20 * 600
+
+
+def test_rank_candidates_ties_keep_search_order():
+    first, second, third = (candidate("Python", channel=name) for name in ("First", "Second", "Third"))
+    ranked = rank_candidates("python", [first, second, third])
+    assert len({c["score"] for c in ranked}) == 1
+    assert [c["playlist_info"]["channel"] for c in ranked] == ["First", "Second", "Third"]
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["python", "--top", "0"], "--top must be at least 1"),
+    (["python", "--top", "-2"], "--top must be at least 1"),
+    (["--serve", "--top", "3"], "--top does not work with --serve"),
+    (["--batch", "courses.txt", "--top", "3"], "--top does not work with --batch"),
+    (["python", "--top", "3", "--engine", "http", "--incremental"],
+     "--top does not work with --engine http, --incremental"),
+    (["python", "--top", "3", "--format", "ndjson"], "--top does not work with --format ndjson"),
+    (["python", "--top", "3", "--metrics-file", "m.prom"], "--top does not work with --metrics-file"),
+])
+def test_main_rejects_conflicting_top(monkeypatch, capsys, argv, message):
+    monkeypatch.setattr(sys, "argv", ["Youtube_scraperV3.py", *argv])
+    with pytest.raises(SystemExit) as exc_info:
+        Youtube_scraperV3.main()
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
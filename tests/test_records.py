@@ -0,0 +1,82 @@
+import datetime
+
+import pytest
+
+import pandas as pd
+
+from records import VideoRecord, parse_video_frame, save_to_table, to_records
+from Youtube_scraperV3 import parse_duration
+
+SCRAPED_AT = "2026-10-17T12:00:00"
+
+
+def video(video_id, **fields):
+    return {"title": video_id, "url": f"https://www.youtube.com/watch?v={video_id}&list=PLtest", "channel": "C",
+            "thumbnail": None, **fields}
+
+
+VIDEOS = [
+    video("a", duration="1:02:03", views="1.2M views", upload_time="3 years ago"),
+    video("b", duration="12:34", views="12,345 views", upload_time="Streamed 2 weeks ago"),
+    video("c", duration="N/A", views="No views", upload_time="N/A"),
+    video("d", duration="5:00", views="", upload_time="1 day ago", publish_date="2020-01-02T00:00:00-08:00",
+          view_count=77, like_count=5, chapters=[{"title": "Intro", "start_seconds": 0}]),
+]
+
+
+def test_parse_video_frame_types_and_values():
+    frame = parse_video_frame(VIDEOS, SCRAPED_AT)
+    assert list(frame["video_id"]) == ["a", "b", "c", "d"]
+    assert list(frame["duration_seconds"]) == [3723, 754, 0, 300]
+    assert frame["view_count"].dtype == "Int64"
+    # Enrichment's exact count wins over the display string
+    assert list(frame["view_count"]) == [1_200_000, 12_345, 0, 77]
+    assert list(frame["published_approx"][[0, 1, 3]]) == [
+        datetime.date(2023, 10, 18), datetime.date(2026, 10, 3), datetime.date(2020, 1, 2)]
+    assert pd.isna(frame["published_approx"][2])
+    assert frame["like_count"].dtype == "Int64"
+
+
+@pytest.mark.parametrize("duration", ["1:02:03", "12:34", "0:07", "LIVE", "N/A", "", None, "a:b"])
+def test_frame_durations_match_parse_duration(duration):
+    frame = parse_video_frame([video("a", duration=duration)])
+    assert frame["duration_seconds"][0] == parse_duration(duration or "")
+
+
+def test_records_agree_with_frame():
+    records = to_records({"videos": VIDEOS, "metadata": {"scraped_at": SCRAPED_AT}})
+    frame = parse_video_frame(VIDEOS, SCRAPED_AT)
+    assert all(isinstance(record, VideoRecord) for record in records)
+    assert not hasattr(records[0], "__dict__")
+    for record, row in zip(records, frame.to_dict("records")):
+        for field, value in record.to_dict().items():
+            assert (None if pd.isna(row[field]) else row[field]) == value, field
+
+
+def test_record_prefers_enriched_figures():
+    record = VideoRecord.from_dict(VIDEOS[3], SCRAPED_AT)
+    assert record.view_count == 77
+    assert record.published_approx == datetime.date(2020, 1, 2)
+    assert record.duration_seconds == 300
+
+
+def test_csv_export_keeps_integer_counts(tmp_path):
+    path = save_to_table({"videos": VIDEOS, "metadata": {"scraped_at": SCRAPED_AT}}, str(tmp_path), "csv", "out.csv")
+    rows = pd.read_csv(path, dtype=str, keep_default_na=False)
+    assert list(rows["like_count"]) == ["", "", "", "5"]
+    assert list(rows["view_count"]) == ["1200000", "12345", "0", "77"]
+    assert rows["chapters"][3] == '[{"title": "Intro", "start_seconds": 0}]'
+
+
+def test_videos_without_enrichment_have_no_enrichment_columns():
+    frame = parse_video_frame(VIDEOS[:2], SCRAPED_AT)
+    assert "like_count" not in frame and "chapters" not in frame
+
+
+def test_parquet_export_round_trips_types(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = save_to_table({"videos": VIDEOS, "metadata": {"scraped_at": SCRAPED_AT}}, str(tmp_path), "parquet", "out.parquet")
+    frame = pd.read_parquet(path)
+    assert frame["like_count"].dtype == "Int64"
+    assert frame["duration_seconds"].dtype == "int64"
+    assert list(frame["chapters"][3][0].values()) == ["Intro", 0]
@@ -0,0 +1,80 @@
+import pytest
+
+import result_cache
+from result_cache import ResultCache, get_or_scrape, normalize_query
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "results.sqlite3"), ttl=60, max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_get_returns_stored_result(cache):
+    cache.put("python", "url", {"videos": [1]})
+    assert cache.get("python", "url") == {"videos": [1]}
+    assert cache.get("python", "other url") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_expired_entries_are_misses_and_deleted(cache, clock):
+    cache.put("python", "url", {"videos": []})
+    clock.now += 59
+    assert cache.get("python", "url") is not None
+    clock.now += 2
+    assert cache.get("python", "url") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    cache.put("a", "url", {"q": "a"})
+    clock.now += 1
+    cache.put("b", "url", {"q": "b"})
+    clock.now += 1
+    assert cache.get("a", "url") == {"q": "a"}
+    clock.now += 1
+    cache.put("c", "url", {"q": "c"})
+    assert cache.get("b", "url") is None
+    assert cache.get("a", "url") == {"q": "a"}
+    assert cache.get("c", "url") == {"q": "c"}
+
+
+def test_stats_survive_reopening(tmp_path, clock):
+    path = str(tmp_path / "results.sqlite3")
+    cache = ResultCache(path)
+    cache.put("a", "url", {})
+    cache.get("a", "url")
+    cache.get("b", "url")
+    cache.close()
+    reopened = ResultCache(path)
+    assert reopened.stats() == {"hits": 1, "misses": 1, "entries": 1}
+    reopened.close()
+
+
+def test_get_or_scrape_normalizes_the_query(cache):
+    calls = []
+
+    def scrape():
+        calls.append(1)
+        return {"videos": len(calls)}
+
+    assert get_or_scrape(cache, "Python  Course", lambda q: f"url/{q}", scrape) == ({"videos": 1}, False)
+    assert get_or_scrape(cache, "python course", lambda q: f"url/{q}", scrape) == ({"videos": 1}, True)
+    assert get_or_scrape(cache, "python course", lambda q: f"url/{q}", scrape, refresh=True) == ({"videos": 2}, False)
+    assert cache.get(normalize_query("PYTHON course"), "url/python course") == {"videos": 2}
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from selector_resolver import FIRST_VISIBLE_JS, SelectorResolutionError, SelectorResolver
+
+CANDIDATES = ["#a", "#b", "#c"]
+
+
+class StubHandle:
+    def __init__(self, value):
+        self.value = value
+
+    def json_value(self):
+        return self.value
+
+
+class StubPage:
+    """Answers ``wait_for_function`` with a fixed winner, or times out when there is none."""
+
+    def __init__(self, winner):
+        self.winner = winner
+        self.calls = []
+
+    def wait_for_function(self, expression, arg=None, timeout=None):
+        self.calls.append((expression, arg, timeout))
+        if self.winner is None:
+            raise TimeoutError("Timeout exceeded")
+        return StubHandle(self.winner)
+
+
+def test_order_prefers_last_winner_then_hits_then_given_order(tmp_path):
+    resolver = SelectorResolver(path=str(tmp_path / "stats.json"))
+    assert resolver.order("search", CANDIDATES) == CANDIDATES
+
+    for winner in ["#c", "#c", "#b"]:
+        resolver.record("search", CANDIDATES, winner, 10)
+    # #b won last; #c has more hits than #a
+    assert resolver.order("search", CANDIDATES) == ["#b", "#c", "#a"]
+
+    resolver.record("search", CANDIDATES, "#c", 10)
+    assert resolver.order("search", CANDIDATES) == ["#c", "#b", "#a"]
+    # Other page types keep their own history
+    assert resolver.order("playlist", CANDIDATES) == CANDIDATES
+
+
+def test_order_keeps_given_order_on_equal_hits(tmp_path):
+    resolver = SelectorResolver(path=str(tmp_path / "stats.json"))
+    for winner in ["#a", "#b", "#c"]:
+        resolver.record("search", CANDIDATES, winner, 10)
+    # #a and #b tie on hits, so the caller's order decides between them
+    assert resolver.order("search", ["#b", "#a", "#c"]) == ["#c", "#b", "#a"]
+    assert resolver.order("search", ["#a", "#b", "#c"]) == ["#c", "#a", "#b"]
+
+
+def test_record_counts_hits_misses_failures_and_latency(tmp_path):
+    resolver = SelectorResolver(path=str(tmp_path / "stats.json"))
+    resolver.record("search", CANDIDATES, "#a", 10)
+    resolver.record("search", CANDIDATES, "#a", 30)
+    resolver.record("search", CANDIDATES, None, 500)
+
+    stats = resolver.stats()["search"]
+    assert stats["last_winner"] == "#a"
+    assert stats["failures"] == 1
+    assert stats["selectors"]["#a"] == {"hits": 2, "misses": 1, "avg_latency_ms": 20.0}
+    assert stats["selectors"]["#b"] == {"hits": 0, "misses": 3, "avg_latency_ms": None}
+
+
+def test_stats_are_saved_and_reloaded(tmp_path):
+    path = tmp_path / "nested" / "stats.json"
+    resolver = SelectorResolver(path=str(path))
+    resolver.record("search", CANDIDATES, "#b", 12)
+    assert json.loads(path.read_text(encoding="utf-8"))["search"]["last_winner"] == "#b"
+
+    reloaded = SelectorResolver(path=str(path))
+    assert reloaded.stats() == resolver.stats()
+    assert reloaded.order("search", CANDIDATES) == ["#b", "#a", "#c"]
+
+
+def test_unreadable_stats_file_starts_empty(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert SelectorResolver(path=str(path)).stats() == {}
+
+
+def test_resolve_races_candidates_in_preferred_order(tmp_path):
+    resolver = SelectorResolver(path=str(tmp_path / "stats.json"))
+    resolver.record("search", CANDIDATES, "#c", 10)
+    page = StubPage("#c")
+
+    assert resolver.resolve(page, "search", CANDIDATES, timeout=500) == "#c"
+    assert page.calls == [(FIRST_VISIBLE_JS, ["#c", "#a", "#b"], 500)]
+    assert resolver.stats()["search"]["selectors"]["#c"]["hits"] == 2
+
+
+def test_resolve_timeout_records_failure(tmp_path):
+    resolver = SelectorResolver(path=str(tmp_path / "stats.json"))
+    with pytest.raises(SelectorResolutionError):
+        resolver.resolve(StubPage(None), "search", CANDIDATES)
+    stats = resolver.stats()["search"]
+    assert stats["failures"] == 1
+    assert stats["last_winner"] is None
+    assert all(s["misses"] == 1 for s in stats["selectors"].values())